@@ -17,8 +17,9 @@ Where:
 - α_avg = average absorption coefficient
 """
 
+import math
 import numpy as np
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
@@ -64,6 +65,18 @@ ABSORPTION_COEFFICIENTS = {
     }
 }
 
+# Octave band centres covered by the coefficient tables
+_OCTAVE_BANDS = (125, 250, 500, 1000, 2000, 4000)
+
+# Dense copy of ABSORPTION_COEFFICIENTS for array lookups
+# Rows follow SurfaceType declaration order, columns follow _OCTAVE_BANDS
+_FREQ_INDEX = {freq: i for i, freq in enumerate(_OCTAVE_BANDS)}
+_TYPE_INDEX = {surface_type: i for i, surface_type in enumerate(SurfaceType)}
+_COEF_TABLE = np.full((len(SurfaceType), len(_FREQ_INDEX)), 0.1)
+for _surface_type, _coefs in ABSORPTION_COEFFICIENTS.items():
+    for _freq, _coef in _coefs.items():
+        _COEF_TABLE[_TYPE_INDEX[_surface_type], _FREQ_INDEX[_freq]] = _coef
+
 # Treatment material absorption coefficients
 TREATMENT_COEFFICIENTS = {
     "2_inch_fiberglass": {
@@ -114,20 +127,22 @@ TREATMENT_COEFFICIENTS = {
 }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Surface:
-    """Represents a room surface"""
+    """Represents a room surface (immutable; edit through AbsorptionCalculator)"""
     name: str
     area: float  # square meters or feet
     surface_type: SurfaceType
     
     def get_absorption(self, frequency: int) -> float:
         """Get absorption (Sabins) at a frequency"""
-        coef = ABSORPTION_COEFFICIENTS.get(self.surface_type, {}).get(frequency, 0.1)
-        return self.area * coef
+        band = _FREQ_INDEX.get(frequency)
+        if band is None:
+            return self.area * 0.1
+        return self.area * _COEF_TABLE[_TYPE_INDEX[self.surface_type], band]
 
 
-@dataclass
+@dataclass(slots=True)
 class AbsorptionResult:
     """Result of absorption calculation"""
     current_t60: Dict[int, float]
@@ -148,8 +163,8 @@ class AbsorptionCalculator:
     Eyring equation for dead rooms (α > 0.2).
     """
     
-    # Octave band center frequencies
-    FREQUENCIES = [125, 250, 500, 1000, 2000, 4000]
+    # Octave band center frequencies (immutable; matches _COEF_TABLE columns)
+    FREQUENCIES = _OCTAVE_BANDS
     
     # Constants
     SABINE_METRIC = 0.161
@@ -170,8 +185,14 @@ class AbsorptionCalculator:
         self.use_metric = use_metric
         self.sabine_constant = self.SABINE_METRIC if use_metric else self.SABINE_IMPERIAL
         
-        self.surfaces: List[Surface] = []
+        self._surfaces: List[Surface] = []
         self._setup_default_surfaces()
+        self._sync_surface_arrays()
+    
+    @property
+    def surfaces(self) -> Tuple[Surface, ...]:
+        """Room surfaces (read-only; use add_surface / set_surface_material)"""
+        return tuple(self._surfaces)
     
     @property
     def volume(self) -> float:
@@ -188,58 +209,99 @@ class AbsorptionCalculator:
     def _setup_default_surfaces(self):
         """Set up default room surfaces (drywall walls, concrete floor, drywall ceiling)"""
         # Floor
-        self.surfaces.append(Surface(
+        self._surfaces.append(Surface(
             name="Floor",
             area=self.length * self.width,
             surface_type=SurfaceType.HARDWOOD
         ))
         
         # Ceiling
-        self.surfaces.append(Surface(
+        self._surfaces.append(Surface(
             name="Ceiling",
             area=self.length * self.width,
             surface_type=SurfaceType.DRYWALL
         ))
         
         # Front wall
-        self.surfaces.append(Surface(
+        self._surfaces.append(Surface(
             name="Front Wall",
             area=self.width * self.height,
             surface_type=SurfaceType.DRYWALL
         ))
         
         # Rear wall
-        self.surfaces.append(Surface(
+        self._surfaces.append(Surface(
             name="Rear Wall",
             area=self.width * self.height,
             surface_type=SurfaceType.DRYWALL
         ))
         
         # Left wall
-        self.surfaces.append(Surface(
+        self._surfaces.append(Surface(
             name="Left Wall",
             area=self.length * self.height,
             surface_type=SurfaceType.DRYWALL
         ))
         
         # Right wall
-        self.surfaces.append(Surface(
+        self._surfaces.append(Surface(
             name="Right Wall",
             area=self.length * self.height,
             surface_type=SurfaceType.DRYWALL
         ))
     
+    def add_surface(self, surface: Surface):
+        """Add a surface (e.g. an extra wall section or a treated area)"""
+        self._surfaces.append(surface)
+        self._sync_surface_arrays()
+    
     def set_surface_material(self, surface_name: str, surface_type: SurfaceType):
         """Change the material of a surface"""
-        for surface in self.surfaces:
+        for i, surface in enumerate(self._surfaces):
             if surface.name.lower() == surface_name.lower():
-                surface.surface_type = surface_type
+                self._surfaces[i] = replace(surface, surface_type=surface_type)
+                self._sync_surface_arrays()
                 return
         raise ValueError(f"Surface '{surface_name}' not found")
     
+    def _sync_surface_arrays(self):
+        """
+        Rebuild the struct-of-arrays view of the surfaces (areas and
+        _COEF_TABLE rows) and the per-band totals. Surfaces are immutable
+        and only change through the methods above, which call this.
+        """
+        self._areas = np.array([s.area for s in self._surfaces], dtype=float)
+        self._type_ids = np.array([_TYPE_INDEX[s.surface_type] for s in self._surfaces], dtype=int)
+        self._band_absorption = self._areas @ _COEF_TABLE[self._type_ids]
+        self._default_absorption = float(self._areas.sum() * 0.1)
+    
+    def calculate_absorption_by_band(self) -> np.ndarray:
+        """Calculate total absorption at every octave band in FREQUENCIES"""
+        return self._band_absorption.copy()
+    
+    def _t60_by_band(self, absorption: np.ndarray) -> np.ndarray:
+        """
+        Vectorized calculate_t60 over a per-band absorption vector.
+        
+        Selects Eyring where α > 0.2 and Sabine elsewhere.
+        """
+        k_v = self.sabine_constant * self.volume
+        alpha = absorption / self.surface_area
+        
+        # Edge cases fall out of IEEE arithmetic: zero absorption gives an
+        # infinite Sabine T60, and α >= 1 (clamped to 1) gives log1p(-1) = -inf
+        # and therefore a zero Eyring T60
+        with np.errstate(divide='ignore'):
+            sabine = k_v / absorption
+            eyring = k_v / (-self.surface_area * np.log1p(-np.minimum(alpha, 1.0)))
+        return np.where(alpha > 0.2, eyring, sabine)
+    
     def calculate_total_absorption(self, frequency: int) -> float:
         """Calculate total absorption at a frequency"""
-        return sum(s.get_absorption(frequency) for s in self.surfaces)
+        band = _FREQ_INDEX.get(frequency)
+        if band is None:
+            return self._default_absorption
+        return float(self._band_absorption[band])
     
     def calculate_average_alpha(self, frequency: int) -> float:
         """Calculate average absorption coefficient at a frequency"""
@@ -273,7 +335,7 @@ class AbsorptionCalculator:
         if alpha <= 0:
             return float('inf')
         
-        return self.sabine_constant * self.volume / (-self.surface_area * np.log(1 - alpha))
+        return self.sabine_constant * self.volume / (-self.surface_area * np.log1p(-alpha))
     
     def calculate_t60(self, frequency: int) -> float:
         """
@@ -307,14 +369,17 @@ class AbsorptionCalculator:
         Returns:
             AbsorptionResult with current state and required treatment
         """
+        absorption = self.calculate_absorption_by_band()
+        t60 = self._t60_by_band(absorption)
+        
         current_t60 = {}
         current_absorption = {}
         required_absorption = {}
         missing_absorption = {}
         
-        for freq in self.FREQUENCIES:
-            current_t60[freq] = self.calculate_t60(freq)
-            current_absorption[freq] = self.calculate_total_absorption(freq)
+        for i, freq in enumerate(self.FREQUENCIES):
+            current_t60[freq] = float(t60[i])
+            current_absorption[freq] = float(absorption[i])
             required_absorption[freq] = self.calculate_required_absorption(target_t60, freq)
             missing_absorption[freq] = max(0, required_absorption[freq] - current_absorption[freq])
         
@@ -395,7 +460,7 @@ class AbsorptionCalculator:
     def get_surface_breakdown(self) -> List[Dict]:
         """Get absorption breakdown by surface"""
         breakdown = []
-        for surface in self.surfaces:
+        for surface in self._surfaces:
             surface_data = {
                 "name": surface.name,
                 "area": surface.area,
@@ -427,4 +492,4 @@ def calculate_panel_count(missing_absorption: float, panel_area: float = 0.5,
         return 0
     
     absorption_per_panel = panel_area * panel_coefficient
-    return int(np.ceil(missing_absorption / absorption_per_panel))
+    return math.ceil(missing_absorption / absorption_per_panel)
@@ -16,10 +16,41 @@ Reference:
 
 import numpy as np
 from dataclasses import dataclass, field
-from typing import Optional, Dict, List
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 
 
-@dataclass
+# Band centres used for the NRC and SAA single-number ratings
+_NRC_FREQS = np.array([250, 500, 1000, 2000], dtype=float)
+_SAA_FREQS = np.array([200, 250, 315, 400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500], dtype=float)
+
+
+def _nearest_indices(freqs: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Indices of the grid points nearest to each target (freqs must be sorted)."""
+    idx = np.clip(np.searchsorted(freqs, targets), 1, len(freqs) - 1)
+    # Step back when the lower neighbour is at least as close (ties go low)
+    idx -= (targets - freqs[idx - 1]) <= (freqs[idx] - targets)
+    return idx
+
+
+@lru_cache(maxsize=32)
+def _frequency_grid(freq_min: float, freq_max: float,
+                    n_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Log-spaced frequency grid plus its NRC and SAA band indices.
+
+    Memoized so repeated calculations on the same grid (e.g. from
+    compare_configurations) share them; the arrays are read-only.
+    """
+    freq = np.geomspace(freq_min, freq_max, n_points)
+    nrc_idx = _nearest_indices(freq, _NRC_FREQS)
+    saa_idx = _nearest_indices(freq, _SAA_FREQS)
+    for arr in (freq, nrc_idx, saa_idx):
+        arr.setflags(write=False)
+    return freq, nrc_idx, saa_idx
+
+
+@dataclass(slots=True)
 class PorousAbsorberResult:
     """Result from a porous absorber calculation."""
     frequencies: np.ndarray
@@ -45,6 +76,12 @@ class PorousAbsorberCalculator:
     RHO0 = 1.204        # kg/m^3
     Z0 = C0 * RHO0      # Characteristic impedance of air
 
+    # Paris integration angles (0 to ~78 degrees) and their sin*cos weights
+    PARIS_THETA = np.linspace(0.001, np.radians(78), 72)
+    PARIS_COS = np.cos(PARIS_THETA)
+    PARIS_WEIGHTS = np.sin(PARIS_THETA) * PARIS_COS
+    PARIS_WEIGHT_SUM = PARIS_WEIGHTS.sum()
+
     # ----------------------------------------------------------------
     # Material presets: flow_resistivity in Pa.s/m^2
     # ----------------------------------------------------------------
@@ -97,13 +134,18 @@ class PorousAbsorberCalculator:
         """
         X = self.RHO0 * freq / sigma
 
-        Zc_real = self.Z0 * (1 + 0.070 * X ** (-0.632))
-        Zc_imag = -self.Z0 * 0.107 * X ** (-0.632)
+        # Miki shares exponents between real/imaginary parts, so each
+        # fractional power only needs to be evaluated once
+        X_zc = X ** (-0.632)
+        X_gamma = X ** (-0.618)
+
+        Zc_real = self.Z0 * (1 + 0.070 * X_zc)
+        Zc_imag = -self.Z0 * 0.107 * X_zc
         Zc = Zc_real + 1j * Zc_imag
 
         k0 = 2 * np.pi * freq / self.C0
-        alpha_val = k0 * 0.160 * X ** (-0.618)
-        beta_val = k0 * (1 + 0.109 * X ** (-0.618))
+        alpha_val = k0 * 0.160 * X_gamma
+        beta_val = k0 * (1 + 0.109 * X_gamma)
         gamma = alpha_val + 1j * beta_val
 
         return Zc, gamma
@@ -111,25 +153,27 @@ class PorousAbsorberCalculator:
     # ----------------------------------------------------------------
     # Surface impedance with transfer matrix
     # ----------------------------------------------------------------
-    def _surface_impedance(self, Zc, gamma, thickness_m, air_gap_m):
+    def _surface_impedance(self, Zc, gamma, thickness_m, air_gap_m, freq):
         """
         Calculate surface impedance of porous layer backed by rigid wall
         with optional air gap, using transfer matrix method.
         """
         if air_gap_m > 0:
-            # Air gap impedance (rigid-backed air layer)
-            k0 = gamma.imag  # approximate wavenumber in air = beta from model
-            # For air gap: use actual air wavenumber
-            freq = np.abs(gamma.imag) * self.C0 / (2 * np.pi)
+            # Air gap impedance (rigid-backed air layer), using the
+            # wavenumber in air rather than in the porous material
             k_air = 2 * np.pi * freq / self.C0
             Z_back = -1j * self.Z0 / np.tan(k_air * air_gap_m)
         else:
             # Rigid wall backing
             Z_back = None
 
-        # Porous layer surface impedance via transfer matrix
-        cosh_gd = np.cosh(gamma * thickness_m)
-        sinh_gd = np.sinh(gamma * thickness_m)
+        # Porous layer surface impedance via transfer matrix.
+        # cosh/sinh are built from a single complex exp; the common factor
+        # of 1/2 cancels in every ratio below, so it is left out.
+        exp_gd = np.exp(gamma * thickness_m)
+        exp_neg_gd = 1.0 / exp_gd
+        cosh_gd = exp_gd + exp_neg_gd
+        sinh_gd = exp_gd - exp_neg_gd
 
         if Z_back is not None:
             # Transfer matrix: layer in front of air gap
@@ -146,7 +190,7 @@ class PorousAbsorberCalculator:
     def _normal_incidence_absorption(self, Z_surface):
         """Normal incidence absorption coefficient."""
         r = (Z_surface - self.Z0) / (Z_surface + self.Z0)
-        alpha = 1 - np.abs(r) ** 2
+        alpha = 1 - (r.real * r.real + r.imag * r.imag)
         return np.clip(alpha, 0, 1)
 
     def _random_incidence_absorption(self, Z_surface):
@@ -154,45 +198,42 @@ class PorousAbsorberCalculator:
         Random incidence (diffuse field) absorption.
         Uses Paris formula integration over angles 0 to ~78 degrees.
         """
-        n_angles = 72
-        theta = np.linspace(0.001, np.radians(78), n_angles)
-        alpha_sum = np.zeros(len(Z_surface), dtype=float)
-        sin_cos_sum = 0.0
-
-        for t in theta:
-            cos_t = np.cos(t)
-            sin_t = np.sin(t)
-            # Oblique incidence reflection
-            r = (Z_surface * cos_t - self.Z0) / (Z_surface * cos_t + self.Z0)
-            alpha_t = 1 - np.abs(r) ** 2
-            alpha_sum += np.clip(alpha_t, 0, 1) * sin_t * cos_t
-            sin_cos_sum += sin_t * cos_t
-
-        alpha_random = alpha_sum / sin_cos_sum
+        # Oblique incidence reflection for all angles at once: (n_angles, n_freqs).
+        # Work in place on two preallocated grids instead of one temporary per op.
+        Z_cos = np.multiply(Z_surface[None, :], self.PARIS_COS[:, None])
+        r = np.subtract(Z_cos, self.Z0)
+        Z_cos += self.Z0
+        r /= Z_cos
+
+        alpha_t = np.multiply(r.real, r.real)
+        alpha_t += r.imag * r.imag
+        np.subtract(1, alpha_t, out=alpha_t)
+        # 1 - |r|^2 is already within [0, 1] for a passive surface (Re(Z) >= 0).
+        # The empirical models can turn non-passive at low X (notably
+        # Delany-Bazley), so the per-angle clip is only needed then.
+        if (Z_surface.real < 0).any():
+            np.clip(alpha_t, 0, 1, out=alpha_t)
+
+        # Weighted sum over angles as a single matrix-vector product
+        alpha_random = (self.PARIS_WEIGHTS @ alpha_t) / self.PARIS_WEIGHT_SUM
         return np.clip(alpha_random, 0, 1)
 
     # ----------------------------------------------------------------
     # NRC and SAA
     # ----------------------------------------------------------------
     @staticmethod
-    def _calc_nrc(freqs, alpha):
+    def _calc_nrc(freqs, alpha, nrc_idx=None):
         """NRC = average of alpha at 250, 500, 1000, 2000 Hz."""
-        nrc_freqs = [250, 500, 1000, 2000]
-        values = []
-        for f in nrc_freqs:
-            idx = np.argmin(np.abs(freqs - f))
-            values.append(alpha[idx])
-        return round(np.mean(values), 2)
+        if nrc_idx is None:
+            nrc_idx = _nearest_indices(freqs, _NRC_FREQS)
+        return round(alpha[nrc_idx].mean(), 2)
 
     @staticmethod
-    def _calc_saa(freqs, alpha):
+    def _calc_saa(freqs, alpha, saa_idx=None):
         """SAA = average at 12 third-octave bands from 200-2500 Hz."""
-        saa_freqs = [200, 250, 315, 400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500]
-        values = []
-        for f in saa_freqs:
-            idx = np.argmin(np.abs(freqs - f))
-            values.append(alpha[idx])
-        return round(np.mean(values), 2)
+        if saa_idx is None:
+            saa_idx = _nearest_indices(freqs, _SAA_FREQS)
+        return round(alpha[saa_idx].mean(), 2)
 
     # ----------------------------------------------------------------
     # Main calculation
@@ -224,7 +265,7 @@ class PorousAbsorberCalculator:
         """
         thickness_m = thickness_mm / 1000.0
         air_gap_m = air_gap_mm / 1000.0
-        freq = np.logspace(np.log10(freq_min), np.log10(freq_max), n_points)
+        freq, nrc_idx, saa_idx = _frequency_grid(freq_min, freq_max, n_points)
 
         # Get material properties
         if model == 'delany_bazley':
@@ -233,22 +274,19 @@ class PorousAbsorberCalculator:
             Zc, gamma = self._miki(freq, flow_resistivity)
 
         # Surface impedance
-        Z_surface = self._surface_impedance(Zc, gamma, thickness_m, air_gap_m)
+        Z_surface = self._surface_impedance(Zc, gamma, thickness_m, air_gap_m, freq)
 
         # Absorption coefficients
         alpha_normal = self._normal_incidence_absorption(Z_surface)
         alpha_random = self._random_incidence_absorption(Z_surface)
 
         # Key metrics
-        nrc = self._calc_nrc(freq, alpha_random)
-        saa = self._calc_saa(freq, alpha_random)
+        nrc = self._calc_nrc(freq, alpha_random, nrc_idx)
+        saa = self._calc_saa(freq, alpha_random, saa_idx)
 
         # Effective low frequency (where alpha_random > 0.5)
-        eff_low = freq_max
-        for i, a in enumerate(alpha_random):
-            if a >= 0.5:
-                eff_low = freq[i]
-                break
+        above = alpha_random >= 0.5
+        eff_low = freq[np.argmax(above)] if above.any() else freq_max
 
         return PorousAbsorberResult(
             frequencies=freq,
@@ -264,7 +302,12 @@ class PorousAbsorberCalculator:
         )
 
     def compare_configurations(self, configs: List[dict]) -> List[PorousAbsorberResult]:
-        """Calculate multiple configurations for comparison."""
+        """
+        Calculate multiple configurations for comparison.
+
+        Configurations on the same frequency grid share the grid and the
+        NRC/SAA band indices through the _frequency_grid cache.
+        """
         return [self.calculate(**cfg) for cfg in configs]
 
     def get_material_presets(self) -> Dict:
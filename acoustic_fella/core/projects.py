@@ -2,15 +2,31 @@
 Project Management for AcFella
 
 Manages rooms/projects so users can save and recall room configurations.
-Data stored in-memory with optional JSON persistence.
+Data stored in-memory with on-disk persistence: projects.msgpack when
+msgpack is installed, otherwise projects.json. An existing
+projects.msgpack is always read as msgpack. Individual changes are
+appended to a write-ahead log (<store>.wal) and folded into the store on
+flush() or once the log grows past WAL_COMPACT_BYTES.
 """
 
 import os
 import json
 import uuid
+import atexit
+from contextlib import contextmanager
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
+
+try:
+    import orjson  # Optional: faster (de)serialization of projects.json
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Optional: compact binary store (projects.msgpack)
+except ImportError:
+    msgpack = None
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 
@@ -52,32 +68,191 @@ class Project:
 class ProjectManager:
     """Manages projects with in-memory store and JSON persistence."""
 
+    # Compact the write-ahead log into the store once it grows past this size
+    WAL_COMPACT_BYTES = 1 << 20
+
     def __init__(self):
-        self._projects: Dict[str, Project] = {}
+        # None marks a loaded project whose Project is built on first access
+        self._projects: Dict[str, Optional[Project]] = {}
+        # Serialized form of each project, keyed by id and tagged with updated_at
+        self._dict_cache: Dict[str, Tuple[str, dict]] = {}
+        self._dirty = False
+        self._batch_depth = 0
+        os.makedirs(DATA_DIR, exist_ok=True)
+        self._path = self._store_path()
+        self._wal_path = self._path + '.wal'
         self._load()
         if not self._projects:
             self._seed()
+        atexit.register(self.flush)
 
-    def _data_path(self):
-        os.makedirs(DATA_DIR, exist_ok=True)
-        return os.path.join(DATA_DIR, 'projects.json')
+    @staticmethod
+    def _store_path() -> str:
+        """
+        The store to use, chosen by what is on disk: an existing
+        projects.msgpack must be read as msgpack, otherwise msgpack is
+        used only when it is installed.
+        """
+        msgpack_path = os.path.join(DATA_DIR, 'projects.msgpack')
+        if os.path.exists(msgpack_path):
+            if msgpack is None:
+                raise RuntimeError(
+                    f"{msgpack_path} exists but msgpack is not installed; "
+                    "install msgpack to read the project store"
+                )
+            return msgpack_path
+        return msgpack_path if msgpack else os.path.join(DATA_DIR, 'projects.json')
 
     def _load(self):
-        path = self._data_path()
+        json_path = os.path.join(DATA_DIR, 'projects.json')
+        migrate = not os.path.exists(self._path) and self._path != json_path and os.path.exists(json_path)
+        path = json_path if migrate else self._path
         if os.path.exists(path):
             try:
-                with open(path) as f:
-                    data = json.load(f)
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                if path.endswith('.msgpack'):
+                    data = msgpack.unpackb(raw, raw=False)
+                else:
+                    data = orjson.loads(raw) if orjson else json.loads(raw)
+                # Keep the records as loaded; they double as the save cache
                 for pd in data:
-                    p = Project(**pd)
-                    self._projects[p.id] = p
+                    self._projects[pd['id']] = None
+                    self._dict_cache[pd['id']] = (pd.get('updated_at', ''), pd)
             except Exception:
                 pass
+        if migrate:
+            # Changes logged against the JSON store come first, then any
+            # made since msgpack took over; the store is rewritten as
+            # msgpack straight away so neither log is needed afterwards
+            self._replay_wal(json_path + '.wal')
+            self._replay_wal(self._wal_path)
+            self.compact()
+            if os.path.exists(json_path + '.wal'):
+                os.remove(json_path + '.wal')
+        else:
+            self._replay_wal(self._wal_path)
+            if self._dirty:
+                # Fold the log into the store now, so the next append does
+                # not land on a torn final record and get dropped with it
+                self.compact()
+
+    def _replay_wal(self, wal_path: str):
+        """Apply changes logged since the store was last written."""
+        if not os.path.exists(wal_path):
+            return
+        with open(wal_path, 'rb') as f:
+            for line in f:
+                try:
+                    rec = orjson.loads(line) if orjson else json.loads(line)
+                except ValueError:
+                    break  # torn final append
+                pid = rec['id']
+                if rec['op'] == 'upsert':
+                    self._projects[pid] = None
+                    self._dict_cache[pid] = (rec['data'].get('updated_at', ''), rec['data'])
+                else:
+                    self._projects.pop(pid, None)
+                    self._dict_cache.pop(pid, None)
+        self._dirty = True
+
+    def _materialize(self, project_id: str) -> Optional[Project]:
+        """Build the Project for a record that has only been loaded so far."""
+        pd = dict(self._dict_cache[project_id][1])
+        pd.pop('volume', None)  # derived from geometry by to_dict()
+        try:
+            p = Project(**pd)
+        except TypeError:
+            # Malformed record: drop it rather than fail every later call
+            del self._projects[project_id]
+            del self._dict_cache[project_id]
+            return None
+        self._projects[project_id] = p
+        return p
+
+    def _save(self, force: bool = False):
+        """Write all projects to disk if there are unsaved changes (or if forced)."""
+        if not (self._dirty or force):
+            return
+        path = self._path
+        tmp_path = path + '.tmp'
+        payload = self._payload()
+        if path.endswith('.msgpack'):
+            with open(tmp_path, 'wb') as f:
+                f.write(msgpack.packb(payload, use_bin_type=True))
+        else:
+            self._write_json(tmp_path, payload)
+        # Atomic swap so a crash mid-write never leaves a truncated file
+        os.replace(tmp_path, path)
+        self._dirty = False
+        # Everything in the log is now in the store
+        if os.path.exists(self._wal_path):
+            os.remove(self._wal_path)
+
+    @staticmethod
+    def _write_json(path: str, payload: list):
+        if orjson:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, 'w') as f:
+                json.dump(payload, f, indent=2)
+
+    def export_json(self, path: str):
+        """Write all projects to a JSON file (same layout as projects.json)."""
+        self._write_json(path, self._payload())
 
-    def _save(self):
-        path = self._data_path()
-        with open(path, 'w') as f:
-            json.dump([p.to_dict() for p in self._projects.values()], f, indent=2)
+    def _payload(self) -> List[dict]:
+        return [self._project_dict(pid, p) for pid, p in self._projects.items()]
+
+    def _project_dict(self, project_id: str, p: Optional[Project]) -> dict:
+        """to_dict() for saving, reused while the project is unchanged."""
+        cached = self._dict_cache.get(project_id)
+        if cached is not None and (p is None or cached[0] == p.updated_at):
+            return cached[1]
+        d = p.to_dict()
+        self._dict_cache[project_id] = (p.updated_at, d)
+        return d
+
+    def _log(self, op: str, project_id: str, data: Optional[dict] = None):
+        """Append a mutation to the write-ahead log."""
+        self._dirty = True
+        rec = {'op': op, 'id': project_id}
+        if data is not None:
+            rec['data'] = data
+        line = orjson.dumps(rec) if orjson else json.dumps(rec).encode()
+        with open(self._wal_path, 'ab') as f:
+            f.write(line + b'\n')
+            size = f.tell()
+        if size > self.WAL_COMPACT_BYTES and not self._batch_depth:
+            self.compact()
+
+    def flush(self):
+        """Fold any logged changes into the store."""
+        self._save()
+
+    def compact(self):
+        """Rewrite the store from memory and clear the write-ahead log."""
+        self._save(force=True)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several create/update/delete calls; the log is compacted
+        into the store once when the outermost batch exits.
+
+        Usage:
+            with manager.batch():
+                for ...:
+                    manager.update(...)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
 
     def _seed(self):
         """Create Sean's Studio as the default project with real measurements."""
@@ -160,13 +335,18 @@ class ProjectManager:
             created_at=now,
             updated_at=now,
         )
-        self._save()
+        self._save(force=True)
 
     def list_all(self) -> List[Project]:
+        for pid in [pid for pid, p in self._projects.items() if p is None]:
+            self._materialize(pid)
         return list(self._projects.values())
 
     def get(self, project_id: str) -> Optional[Project]:
-        return self._projects.get(project_id)
+        p = self._projects.get(project_id)
+        if p is None and project_id in self._projects:
+            p = self._materialize(project_id)
+        return p
 
     def create(self, name: str, description: str = '', room_type: str = 'mixing_mastering',
                geometry: dict = None, tags: list = None, notes: str = '') -> Project:
@@ -178,23 +358,25 @@ class ProjectManager:
             created_at=now, updated_at=now,
         )
         self._projects[pid] = p
-        self._save()
+        self._log('upsert', pid, self._project_dict(pid, p))
         return p
 
     def update(self, project_id: str, updates: dict) -> Optional[Project]:
-        p = self._projects.get(project_id)
+        p = self.get(project_id)
         if not p:
             return None
         for key in ('name', 'description', 'room_type', 'geometry', 'tags', 'notes'):
             if key in updates:
                 setattr(p, key, updates[key])
         p.updated_at = datetime.utcnow().isoformat()
-        self._save()
+        self._dict_cache.pop(project_id, None)
+        self._log('upsert', project_id, self._project_dict(project_id, p))
         return p
 
     def delete(self, project_id: str) -> bool:
         if project_id in self._projects:
             del self._projects[project_id]
-            self._save()
+            self._dict_cache.pop(project_id, None)
+            self._log('delete', project_id)
             return True
         return False
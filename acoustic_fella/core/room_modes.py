@@ -15,9 +15,11 @@ Mode Types:
 - Oblique: Three dimensions (-9dB per reflection)
 """
 
+import math
 import numpy as np
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from functools import lru_cache
+from typing import List, Tuple, Dict, Optional
 from enum import Enum
 
 
@@ -27,16 +29,36 @@ class ModeType(Enum):
     OBLIQUE = "oblique"
 
 
-@dataclass
+# ModeType for each mode type code (0 = axial, 1 = tangential, 2 = oblique)
+_MODE_TYPES = (ModeType.AXIAL, ModeType.TANGENTIAL, ModeType.OBLIQUE)
+
+# Relative energy factor for each mode type code
+_ENERGY_FACTORS = (1.0, 0.5, 0.25)
+
+# 1/3 octave: band edges are the center divided/multiplied by 2^(1/6)
+_THIRD_OCT_FACTOR = 2 ** (1/6)
+
+# 1/3 octave band center frequencies used by the Bonello criterion
+# (20 Hz to 200 Hz) and their band edges
+_BONELLO_CENTERS = (20, 25, 31.5, 40, 50, 63, 80, 100, 125, 160, 200)
+_BONELLO_LOWS = np.array(_BONELLO_CENTERS) / _THIRD_OCT_FACTOR
+_BONELLO_HIGHS = np.array(_BONELLO_CENTERS) * _THIRD_OCT_FACTOR
+
+
+@dataclass(slots=True)
 class RoomMode:
     """Represents a single room mode"""
     frequency: float
     p: int  # Length mode number
     q: int  # Width mode number
     r: int  # Height mode number
-    mode_type: ModeType
+    mode_type_code: int  # Index into _MODE_TYPES
     wavelength: float
     
+    @property
+    def mode_type(self) -> ModeType:
+        return _MODE_TYPES[self.mode_type_code]
+    
     @property
     def mode_string(self) -> str:
         return f"({self.p},{self.q},{self.r})"
@@ -44,12 +66,53 @@ class RoomMode:
     @property
     def energy_factor(self) -> float:
         """Relative energy factor based on mode type"""
-        if self.mode_type == ModeType.AXIAL:
-            return 1.0
-        elif self.mode_type == ModeType.TANGENTIAL:
-            return 0.5
-        else:
-            return 0.25
+        return _ENERGY_FACTORS[self.mode_type_code]
+
+
+@lru_cache(maxsize=64)
+def _compute_modes(length: float, width: float, height: float, speed_of_sound: float,
+                   max_frequency: float, max_mode_order: int) -> Tuple[np.ndarray, ...]:
+    """
+    Room modes up to max_frequency as parallel arrays sorted by frequency.
+    
+    Returns (freqs, p, q, r, type_code, wavelength), with type_code 0/1/2
+    for axial/tangential/oblique. Memoized on the room geometry,
+    so repeated analyses of the same room share one computation; the
+    arrays are read-only.
+    """
+    # Each term is non-negative and grows with its mode number, so no mode
+    # can be below max_frequency once its axial component alone is above
+    # it; trim each axis to the orders whose axial mode is in range.
+    orders = np.arange(max_mode_order + 1)
+    terms = []
+    for dim in (length, width, height):
+        term = orders / dim
+        term *= term
+        axial = (speed_of_sound / 2) * np.sqrt(term)
+        terms.append(term[:np.count_nonzero(axial <= max_frequency)])
+    
+    # Evaluate the Rayleigh equation for every remaining (p, q, r) at once.
+    # The per-axis terms are broadcast into a single float buffer, which
+    # the sqrt and scaling then reuse; no index grids are materialized.
+    freqs = np.add.outer(np.add.outer(terms[0], terms[1]), terms[2]).ravel()
+    np.sqrt(freqs, out=freqs)
+    freqs *= speed_of_sound / 2
+    
+    # Skip the (0,0,0) mode and anything above max_frequency
+    keep = np.flatnonzero((freqs > 0) & (freqs <= max_frequency))
+    
+    # Sort by frequency (stable, so equal frequencies keep (p, q, r) order)
+    keep = keep[np.argsort(freqs[keep], kind='stable')]
+    freqs = freqs[keep]
+    p, q, r = np.unravel_index(keep, tuple(len(t) for t in terms))
+    
+    # Active dimensions minus one: 0 = axial, 1 = tangential, 2 = oblique
+    type_code = (p > 0).astype(np.int8) + (q > 0) + (r > 0) - 1
+    
+    result = (freqs, p, q, r, type_code, speed_of_sound / freqs)
+    for arr in result:
+        arr.setflags(write=False)
+    return result
 
 
 class RoomModeCalculator:
@@ -63,6 +126,20 @@ class RoomModeCalculator:
     SPEED_OF_SOUND_METRIC = 344.0  # m/s
     SPEED_OF_SOUND_IMPERIAL = 1130.0  # ft/s
     
+    # Common musical bass notes (Hz), in ascending frequency order
+    _BASS_NAMES = ("E1", "F1", "G1", "A1", "B1", "C2", "D2", "E2", "F2", "G2", "A2", "B2")
+    _BASS_FREQS = np.array([41.2, 43.7, 49.0, 55.0, 61.7, 65.4, 73.4, 82.4, 87.3, 98.0, 110.0, 123.5])
+    
+    # Optimal room ratios (smallest dimension first), one row per source
+    _OPTIMAL_NAMES = ("Bolt", "IEC", "Sepmeyer A", "Sepmeyer B", "Louden")
+    _OPTIMAL_MATRIX = np.array([
+        [1.0, 1.28, 1.54],
+        [1.0, 1.4, 1.9],
+        [1.0, 1.14, 1.39],
+        [1.0, 1.28, 1.54],
+        [1.0, 1.4, 1.9],
+    ])
+    
     def __init__(self, length: float, width: float, height: float, 
                  use_metric: bool = True, temperature_c: float = 20.0):
         """
@@ -88,7 +165,13 @@ class RoomModeCalculator:
         else:
             self.speed_of_sound = (331.3 + 0.606 * temperature_c) * 3.281
         
-        self._modes: List[RoomMode] = []
+        # Current modes as parallel arrays sorted by frequency
+        # (freq, p, q, r, type_code, wavelength); RoomMode objects are
+        # only built for what the public methods return
+        self._mode_table: Dict[str, np.ndarray] = {}
+        # Analyses of the current mode table, dropped whenever it changes
+        self._spacing_cache: Optional[Dict] = None
+        self._bonello_cache: Dict[float, Dict] = {}
         
     @property
     def volume(self) -> float:
@@ -110,12 +193,10 @@ class RoomModeCalculator:
         
         f = (c/2) * sqrt((p/L)² + (q/W)² + (r/H)²)
         """
-        term = np.sqrt(
-            (p / self.length) ** 2 +
-            (q / self.width) ** 2 +
-            (r / self.height) ** 2
-        )
-        return (self.speed_of_sound / 2) * term
+        a = p / self.length
+        b = q / self.width
+        c = r / self.height
+        return (self.speed_of_sound / 2) * math.sqrt(a * a + b * b + c * c)
     
     def get_mode_type(self, p: int, q: int, r: int) -> ModeType:
         """Determine the type of mode based on active dimensions"""
@@ -140,47 +221,64 @@ class RoomModeCalculator:
         Returns:
             List of RoomMode objects sorted by frequency
         """
-        modes = []
-        
-        for p in range(max_mode_order + 1):
-            for q in range(max_mode_order + 1):
-                for r in range(max_mode_order + 1):
-                    # Skip the (0,0,0) mode
-                    if p == 0 and q == 0 and r == 0:
-                        continue
-                    
-                    freq = self.calculate_mode_frequency(p, q, r)
-                    
-                    if freq <= max_frequency:
-                        mode_type = self.get_mode_type(p, q, r)
-                        wavelength = self.speed_of_sound / freq
-                        
-                        mode = RoomMode(
-                            frequency=freq,
-                            p=p,
-                            q=q,
-                            r=r,
-                            mode_type=mode_type,
-                            wavelength=wavelength
-                        )
-                        modes.append(mode)
-        
-        # Sort by frequency
-        modes.sort(key=lambda m: m.frequency)
-        self._modes = modes
-        return modes
+        self._update_mode_table(max_frequency, max_mode_order)
+        return self._make_modes()
+    
+    def _update_mode_table(self, max_frequency: float = 300.0, max_mode_order: int = 10):
+        self._mode_table = dict(zip(
+            ('freq', 'p', 'q', 'r', 'type_code', 'wavelength'),
+            _compute_modes(self.length, self.width, self.height, self.speed_of_sound,
+                           max_frequency, max_mode_order)
+        ))
+        self._spacing_cache = None
+        self._bonello_cache = {}
+    
+    def _ensure_modes(self, max_frequency: float = 300.0) -> Dict[str, np.ndarray]:
+        """Current mode table, calculated up to max_frequency if still empty."""
+        if not len(self._mode_table.get('freq', ())):
+            self._update_mode_table(max_frequency)
+        return self._mode_table
+    
+    def _make_modes(self, index=slice(None)) -> List[RoomMode]:
+        """RoomMode objects for the given rows of the mode table."""
+        t = self._mode_table
+        return [
+            RoomMode(
+                frequency=freq,
+                p=p,
+                q=q,
+                r=r,
+                mode_type_code=code,
+                wavelength=wavelength
+            )
+            for freq, p, q, r, code, wavelength in zip(
+                *(t[k][index].tolist() for k in ('freq', 'p', 'q', 'r', 'type_code', 'wavelength'))
+            )
+        ]
+    
+    def as_arrays(self, max_frequency: float = 300.0) -> Tuple[np.ndarray, ...]:
+        """
+        Current modes as read-only parallel arrays sorted by frequency.
+        
+        Returns:
+            (freqs, p, q, r, type_code), with type_code 0/1/2 for
+            axial/tangential/oblique. These are the calculator's own
+            arrays, not copies.
+        """
+        t = self._ensure_modes(max_frequency)
+        return t['freq'], t['p'], t['q'], t['r'], t['type_code']
     
     def get_axial_modes(self, max_frequency: float = 300.0) -> List[RoomMode]:
         """Get only axial modes (most energetic)"""
-        if not self._modes:
-            self.calculate_all_modes(max_frequency)
-        return [m for m in self._modes if m.mode_type == ModeType.AXIAL]
+        table = self._ensure_modes(max_frequency)
+        return self._make_modes(np.flatnonzero(table['type_code'] == 0))
     
     def get_modes_in_band(self, low_freq: float, high_freq: float) -> List[RoomMode]:
         """Get modes within a frequency band"""
-        if not self._modes:
-            self.calculate_all_modes(max(high_freq, 300.0))
-        return [m for m in self._modes if low_freq <= m.frequency <= high_freq]
+        freqs = self._ensure_modes(max(high_freq, 300.0))['freq']
+        lo = np.searchsorted(freqs, low_freq, side='left')
+        hi = np.searchsorted(freqs, high_freq, side='right')
+        return self._make_modes(slice(lo, hi))
     
     def analyze_mode_spacing(self) -> Dict[str, any]:
         """
@@ -190,43 +288,54 @@ class RoomModeCalculator:
         - Average mode spacing
         - Minimum spacing (potential problem areas)
         - Mode clusters (multiple modes within 5Hz)
+        
+        The result is cached until the modes are recalculated.
         """
-        if not self._modes:
-            self.calculate_all_modes()
+        table = self._ensure_modes()
+        if self._spacing_cache is not None:
+            return self._spacing_cache
         
-        if len(self._modes) < 2:
+        if len(table['freq']) < 2:
             return {"error": "Not enough modes to analyze"}
         
         # Calculate spacings
-        frequencies = [m.frequency for m in self._modes]
-        spacings = np.diff(frequencies)
-        
-        # Find clusters (modes within 5Hz of each other)
+        freqs = table['freq']
+        spacings = np.diff(freqs)
+        
+        # Find clusters (modes within 5Hz of the first mode of the cluster).
+        # ends[i] is one past the last mode within 5Hz of mode i, so only
+        # modes with a neighbour in range can start a cluster; a cluster
+        # consumes its modes and the scan resumes after it.
+        ends = np.searchsorted(freqs, freqs + 5, side='right')
+        starts = np.flatnonzero(ends - np.arange(len(freqs)) > 1)
         clusters = []
         i = 0
-        while i < len(frequencies):
-            cluster = [frequencies[i]]
-            j = i + 1
-            while j < len(frequencies) and frequencies[j] - frequencies[i] <= 5:
-                cluster.append(frequencies[j])
-                j += 1
-            if len(cluster) > 1:
-                clusters.append({
-                    "frequencies": cluster,
-                    "center": np.mean(cluster),
-                    "count": len(cluster)
-                })
-            i = j if j > i + 1 else i + 1
-        
-        return {
-            "total_modes": len(self._modes),
-            "average_spacing": float(np.mean(spacings)),
-            "min_spacing": float(np.min(spacings)),
-            "max_spacing": float(np.max(spacings)),
-            "std_spacing": float(np.std(spacings)),
+        for start, end in zip(starts.tolist(), ends[starts].tolist()):
+            if start < i:
+                continue
+            cluster = freqs[start:end]
+            clusters.append({
+                "frequencies": cluster.tolist(),
+                "center": cluster.mean(),
+                "count": len(cluster)
+            })
+            i = end
+        
+        # Spacing statistics as Python floats in one conversion
+        mean_sp, min_sp, max_sp, std_sp = np.array(
+            [spacings.mean(), spacings.min(), spacings.max(), spacings.std()]
+        ).tolist()
+        
+        self._spacing_cache = {
+            "total_modes": len(freqs),
+            "average_spacing": mean_sp,
+            "min_spacing": min_sp,
+            "max_spacing": max_sp,
+            "std_spacing": std_sp,
             "clusters": clusters,
             "problem_frequencies": [c["center"] for c in clusters if c["count"] >= 3]
         }
+        return self._spacing_cache
     
     def bonello_analysis(self, max_frequency: float = 200.0) -> Dict[str, any]:
         """
@@ -237,32 +346,33 @@ class RoomModeCalculator:
         constant mode count in each subsequent band.
         
         Returns:
-            Dict with band analysis and pass/fail status
+            Dict with band analysis and pass/fail status (cached until the
+            modes are recalculated)
         """
-        if not self._modes:
-            self.calculate_all_modes(max_frequency)
-        
-        # 1/3 octave band center frequencies (20 Hz to 200 Hz)
-        band_centers = [20, 25, 31.5, 40, 50, 63, 80, 100, 125, 160, 200]
-        
-        # Calculate band edges (1/3 octave: multiply/divide by 2^(1/6))
-        factor = 2 ** (1/6)
+        table = self._ensure_modes(max_frequency)
+        freqs = table['freq']
+        if max_frequency in self._bonello_cache:
+            return self._bonello_cache[max_frequency]
+        
+        # Bands up to max_frequency
+        n_bands = sum(c <= max_frequency for c in _BONELLO_CENTERS)
+        band_centers = _BONELLO_CENTERS[:n_bands]
+        lows = _BONELLO_LOWS[:n_bands]
+        highs = _BONELLO_HIGHS[:n_bands]
+        
+        # Mode count per band from two binary searches over the sorted modes
+        lo_idx = np.searchsorted(freqs, lows, side='left')
+        hi_idx = np.searchsorted(freqs, highs, side='right')
+        counts = hi_idx - lo_idx
         
         band_analysis = []
         previous_count = 0
         passes_criterion = True
         problem_bands = []
         
-        for center in band_centers:
-            if center > max_frequency:
-                break
-                
-            low = center / factor
-            high = center * factor
-            
-            modes_in_band = self.get_modes_in_band(low, high)
-            count = len(modes_in_band)
-            
+        for center, low, high, lo, hi, count in zip(
+                band_centers, lows.tolist(), highs.tolist(),
+                lo_idx.tolist(), hi_idx.tolist(), counts.tolist()):
             # Check Bonello criterion
             if count < previous_count and previous_count > 0:
                 passes_criterion = False
@@ -273,13 +383,16 @@ class RoomModeCalculator:
                 "low_frequency": round(low, 1),
                 "high_frequency": round(high, 1),
                 "mode_count": count,
-                "modes": [m.mode_string for m in modes_in_band],
+                # Mode strings straight from the index arrays, as RoomMode.mode_string
+                "modes": [f"({p},{q},{r})" for p, q, r in zip(
+                    table['p'][lo:hi].tolist(), table['q'][lo:hi].tolist(), table['r'][lo:hi].tolist()
+                )],
                 "passes": count >= previous_count or previous_count == 0
             })
             
             previous_count = count
         
-        return {
+        self._bonello_cache[max_frequency] = {
             "passes_bonello": passes_criterion,
             "band_analysis": band_analysis,
             "problem_bands": problem_bands,
@@ -288,6 +401,7 @@ class RoomModeCalculator:
                 else f"Consider adjusting room dimensions. Problem bands at {problem_bands} Hz"
             )
         }
+        return self._bonello_cache[max_frequency]
     
     def get_optimal_ratios(self) -> Dict[str, any]:
         """
@@ -304,19 +418,12 @@ class RoomModeCalculator:
         # Normalize to smallest dimension
         ratios = [d / dims[0] for d in dims]
         
-        # Optimal ratios
-        optimal_sets = {
-            "Bolt": [1.0, 1.28, 1.54],
-            "IEC": [1.0, 1.4, 1.9],
-            "Sepmeyer A": [1.0, 1.14, 1.39],
-            "Sepmeyer B": [1.0, 1.28, 1.54],
-            "Louden": [1.0, 1.4, 1.9]
-        }
+        # Calculate deviation from each optimal set in one pass
+        deviations = np.linalg.norm(self._OPTIMAL_MATRIX - np.asarray(ratios), axis=1)
         
-        # Calculate deviation from each optimal set
         comparisons = {}
-        for name, optimal in optimal_sets.items():
-            deviation = np.sqrt(sum((r - o) ** 2 for r, o in zip(ratios, optimal)))
+        for name, optimal, deviation in zip(self._OPTIMAL_NAMES, self._OPTIMAL_MATRIX.tolist(),
+                                            deviations.tolist()):
             comparisons[name] = {
                 "optimal_ratios": optimal,
                 "deviation": round(deviation, 3),
@@ -325,17 +432,19 @@ class RoomModeCalculator:
                                 "Fair" if deviation < 0.3 else "Poor"
             }
         
-        best_match = min(comparisons.items(), key=lambda x: x[1]["deviation"])
+        # First set with the smallest (rounded) deviation
+        best_match = min(comparisons, key=lambda name: comparisons[name]["deviation"])
         
         return {
             "current_ratios": [round(r, 2) for r in ratios],
             "dimensions_sorted": dims,
             "comparisons": comparisons,
-            "best_match": best_match[0],
-            "best_deviation": best_match[1]["deviation"]
+            "best_match": best_match,
+            "best_deviation": comparisons[best_match]["deviation"]
         }
     
-    def get_problematic_frequencies(self, threshold_db: float = 3.0) -> List[Dict]:
+    def get_problematic_frequencies(self, threshold_db: float = 3.0,
+                                    spacing_analysis: Optional[Dict] = None) -> List[Dict]:
         """
         Identify frequencies that are likely to be problematic.
         
@@ -343,35 +452,39 @@ class RoomModeCalculator:
         - Mode clusters (multiple modes within 5Hz)
         - Strong axial modes at common bass frequencies
         - Modes near common musical frequencies
+        
+        Args:
+            spacing_analysis: Result of analyze_mode_spacing() for the current
+                              modes, if the caller already has it
         """
-        if not self._modes:
-            self.calculate_all_modes()
+        table = self._ensure_modes()
         
         problems = []
         
-        # Common musical bass notes (Hz)
-        bass_notes = {
-            "E1": 41.2, "F1": 43.7, "G1": 49.0, "A1": 55.0,
-            "B1": 61.7, "C2": 65.4, "D2": 73.4, "E2": 82.4,
-            "F2": 87.3, "G2": 98.0, "A2": 110.0, "B2": 123.5
-        }
-        
-        for mode in self._modes:
-            if mode.mode_type == ModeType.AXIAL:
-                # Check if near a musical note
-                for note, freq in bass_notes.items():
-                    if abs(mode.frequency - freq) < 3:  # Within 3Hz
-                        problems.append({
-                            "frequency": mode.frequency,
-                            "mode": mode.mode_string,
-                            "type": "axial_near_note",
-                            "note": note,
-                            "severity": "high",
-                            "recommendation": f"Strong mode at {mode.frequency:.1f}Hz near {note}. Bass trap recommended."
-                        })
+        # Axial modes near a musical note (within 3Hz), in mode then note order.
+        # Binary search bounds the axial modes to the note range (with 1Hz of
+        # slack so it stays a superset of the exact test); only those are
+        # compared against the notes.
+        axial = np.flatnonzero(table['type_code'] == 0)
+        axial_freqs = table['freq'][axial]
+        lo = np.searchsorted(axial_freqs, self._BASS_FREQS[0] - 4, side='left')
+        hi = np.searchsorted(axial_freqs, self._BASS_FREQS[-1] + 4, side='right')
+        axial = axial[lo:hi]
+        near = np.abs(axial_freqs[lo:hi, None] - self._BASS_FREQS[None, :]) < 3
+        mode_rows, note_cols = np.nonzero(near)
+        for mode, col in zip(self._make_modes(axial[mode_rows]), note_cols.tolist()):
+            note = self._BASS_NAMES[col]
+            problems.append({
+                "frequency": mode.frequency,
+                "mode": mode.mode_string,
+                "type": "axial_near_note",
+                "note": note,
+                "severity": "high",
+                "recommendation": f"Strong mode at {mode.frequency:.1f}Hz near {note}. Bass trap recommended."
+            })
         
         # Check for clusters
-        analysis = self.analyze_mode_spacing()
+        analysis = spacing_analysis if spacing_analysis is not None else self.analyze_mode_spacing()
         for cluster in analysis.get("clusters", []):
             if cluster["count"] >= 2:
                 problems.append({
@@ -386,7 +499,9 @@ class RoomModeCalculator:
     
     def generate_report(self) -> Dict[str, any]:
         """Generate a comprehensive room mode analysis report"""
-        self.calculate_all_modes()
+        self._update_mode_table()
+        type_counts = np.bincount(self._mode_table['type_code'], minlength=3).tolist()
+        spacing_analysis = self.analyze_mode_spacing()
         
         return {
             "room_info": {
@@ -398,15 +513,15 @@ class RoomModeCalculator:
                 "unit": "meters" if self.use_metric else "feet"
             },
             "modes": {
-                "total": len(self._modes),
-                "axial": len([m for m in self._modes if m.mode_type == ModeType.AXIAL]),
-                "tangential": len([m for m in self._modes if m.mode_type == ModeType.TANGENTIAL]),
-                "oblique": len([m for m in self._modes if m.mode_type == ModeType.OBLIQUE]),
+                "total": sum(type_counts),
+                "axial": type_counts[0],
+                "tangential": type_counts[1],
+                "oblique": type_counts[2],
                 "first_10": [{"freq": m.frequency, "mode": m.mode_string, "type": m.mode_type.value} 
-                            for m in self._modes[:10]]
+                            for m in self._make_modes(slice(10))]
             },
             "ratio_analysis": self.get_optimal_ratios(),
             "bonello": self.bonello_analysis(),
-            "spacing_analysis": self.analyze_mode_spacing(),
-            "problems": self.get_problematic_frequencies()
+            "spacing_analysis": spacing_analysis,
+            "problems": self.get_problematic_frequencies(spacing_analysis=spacing_analysis)
         }
@@ -12,11 +12,15 @@ Below the Schroeder frequency: Bass traps needed
 Above the Schroeder frequency: Absorbers and diffusers effective
 """
 
+import math
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
+# 1/3 octave: a band spans the center divided/multiplied by 2^(1/6)
+_THIRD_OCT_FACTOR = 2 ** (1/6)
+
 @dataclass
 class SchroederAnalysis:
     """Results of Schroeder frequency analysis"""
@@ -46,6 +50,18 @@ class SchroederAnalyzer:
     
     SPEED_OF_SOUND = 344.0  # m/s at 20°C
     
+    # 4π / c³, the constant part of the modal density
+    _MODAL_DENSITY_COEFF = 4 * math.pi / SPEED_OF_SOUND ** 3
+    
+    # (behavior, recommended treatment) per frequency region relative to fc:
+    # below fc/2, below fc, below 2*fc, and above
+    FREQUENCY_BEHAVIORS = (
+        ("Strong modal", "Bass traps"),
+        ("Transitional (modal dominant)", "Thick absorbers + bass traps"),
+        ("Transitional (diffuse dominant)", "Broadband absorbers"),
+        ("Diffuse field", "Absorbers + Diffusers"),
+    )
+    
     def __init__(self, volume: float, t60: float = 0.3, use_metric: bool = True):
         """
         Initialize Schroeder analyzer.
@@ -71,7 +87,7 @@ class SchroederAnalyzer:
         
         fc = 2000 * sqrt(T60 / V)
         """
-        return 2000 * np.sqrt(self.t60 / self.volume)
+        return 2000 * math.sqrt(self.t60 / self.volume)
     
     def calculate_modal_density(self, frequency: float) -> float:
         """
@@ -81,8 +97,7 @@ class SchroederAnalyzer:
         
         Where V is volume and c is speed of sound.
         """
-        c = self.SPEED_OF_SOUND
-        return (4 * np.pi * self.volume * frequency**2) / (c**3)
+        return self.volume * frequency * frequency * self._MODAL_DENSITY_COEFF
     
     def calculate_modal_overlap(self, frequency: float) -> float:
         """
@@ -97,6 +112,40 @@ class SchroederAnalyzer:
         delta_f = 2.2 / self.t60  # Approximate -3dB bandwidth
         return self.calculate_modal_density(frequency) * delta_f
     
+    def compare_modal_density(self, mode_arrays: Tuple[np.ndarray, ...],
+                              band_edges: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compare calculated room modes with the statistical modal density.
+        
+        Args:
+            mode_arrays: RoomModeCalculator.as_arrays() for this room,
+                         (freqs, p, q, r, type_code) sorted by frequency
+            band_edges: Ascending band edge frequencies (Hz); band i is
+                        edges[i] <= f < edges[i+1]
+            
+        Returns:
+            Dict of per-band arrays: 'counts' and 'axial_counts' (modes
+            in each band), 'density' (counts per Hz), 'expected_counts'
+            (n(f) integrated over the band) and 'expected_density' (n(f)
+            at the geometric band center)
+        """
+        freqs, type_code = mode_arrays[0], mode_arrays[4]
+        edges = np.asarray(band_edges, dtype=float)
+        
+        # Frequencies are sorted, so each band is a slice between two
+        # binary-search positions; axial counts come from a running total
+        bounds = np.searchsorted(freqs, edges)
+        axial_before = np.concatenate(([0], np.cumsum(type_code == 0)))
+        counts = np.diff(bounds)
+        
+        return {
+            "counts": counts,
+            "axial_counts": np.diff(axial_before[bounds]),
+            "density": counts / np.diff(edges),
+            "expected_counts": self.volume * self._MODAL_DENSITY_COEFF * np.diff(edges ** 3) / 3,
+            "expected_density": self.calculate_modal_density(np.sqrt(edges[:-1] * edges[1:])),
+        }
+    
     def analyze(self) -> SchroederAnalysis:
         """Perform complete Schroeder analysis"""
         fc = self.calculate_schroeder_frequency()
@@ -105,15 +154,13 @@ class SchroederAnalyzer:
         md = self.calculate_modal_density(fc)
         
         # Transition region (typically ±1/3 octave around fc)
-        factor = 2 ** (1/6)  # 1/3 octave
-        
         return SchroederAnalysis(
             schroeder_frequency=fc,
             modal_density=md,
             room_volume=self.volume,
             t60=self.t60,
-            transition_region_low=fc / factor,
-            transition_region_high=fc * factor
+            transition_region_low=fc / _THIRD_OCT_FACTOR,
+            transition_region_high=fc * _THIRD_OCT_FACTOR
         )
     
     def get_treatment_zones(self) -> Dict[str, any]:
@@ -230,17 +277,14 @@ class SchroederAnalyzer:
         modal_density = self.calculate_modal_density(frequency)
         
         if frequency < fc / 2:
-            behavior = "Strong modal"
-            treatment = "Bass traps"
+            region = 0
         elif frequency < fc:
-            behavior = "Transitional (modal dominant)"
-            treatment = "Thick absorbers + bass traps"
+            region = 1
         elif frequency < fc * 2:
-            behavior = "Transitional (diffuse dominant)"
-            treatment = "Broadband absorbers"
+            region = 2
         else:
-            behavior = "Diffuse field"
-            treatment = "Absorbers + Diffusers"
+            region = 3
+        behavior, treatment = self.FREQUENCY_BEHAVIORS[region]
         
         return {
             "frequency": frequency,
@@ -251,6 +295,30 @@ class SchroederAnalyzer:
             "behavior": behavior,
             "recommended_treatment": treatment
         }
+    
+    def get_frequency_behavior_batch(self, frequencies: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized get_frequency_behavior for a sweep of frequencies.
+        
+        Returns:
+            Dict of arrays aligned with frequencies: 'frequency',
+            'modal_density', 'modal_overlap', 'is_modal' and 'region'
+            (index into FREQUENCY_BEHAVIORS), plus the scalar
+            'schroeder_frequency'
+        """
+        freqs = np.asarray(frequencies, dtype=float)
+        fc = self.calculate_schroeder_frequency()
+        
+        region = np.select([freqs < fc / 2, freqs < fc, freqs < fc * 2], [0, 1, 2], default=3)
+        
+        return {
+            "frequency": freqs,
+            "schroeder_frequency": fc,
+            "modal_density": self.calculate_modal_density(freqs),
+            "modal_overlap": self.calculate_modal_overlap(freqs),
+            "is_modal": freqs < fc,
+            "region": region,
+        }
 
 
 def calculate_schroeder_from_dimensions(length: float, width: float, height: float,
@@ -14,21 +14,171 @@ Extracts:
 - Waterfall data (if available)
 """
 
+import io
 import numpy as np
 import re
 import json
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 import struct
+import warnings
+
+
+# First integer on an IR header line mentioning the sample rate
+_RATE_RE = re.compile(r'(\d+)')
+
+# WAV layouts: RIFF header, chunk header, and the 16-byte PCM 'fmt ' body
+_RIFF_HEADER = struct.Struct('<4sI4s')
+_CHUNK_HEADER = struct.Struct('<4sI')
+_FMT_CHUNK = struct.Struct('<HHIIHH')
+
+
+@lru_cache(maxsize=None)
+def _scipy_signal():
+    """scipy.signal, imported on first peak search rather than at import time"""
+    from scipy import signal
+    return signal
+
+
+@lru_cache(maxsize=None)
+def _scipy_wavfile():
+    """scipy.io.wavfile, or None if SciPy is not installed (checked once)"""
+    try:
+        from scipy.io import wavfile
+    except ImportError:
+        return None
+    return wavfile
+
+
+def _load_table(source, **kwargs) -> Optional[np.ndarray]:
+    """
+    np.loadtxt as a 2-D table, or None if the input is not a regular
+    non-empty numeric table (callers then use a line-by-line parser).
+    """
+    try:
+        with warnings.catch_warnings():
+            # Empty input is reported through the None return instead
+            warnings.simplefilter('ignore', UserWarning)
+            table = np.loadtxt(source, ndmin=2, **kwargs)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return table if table.size else None
+
+
+def _is_fr_header(line: str) -> bool:
+    """Metadata/comment line or a column header mentioning freq/Hz"""
+    lower = line.lower()
+    return line.startswith('*') or 'freq' in lower or 'hz' in lower
+
+
+def _is_ir_header(line: str) -> bool:
+    """Metadata/comment line"""
+    return line.startswith('*')
+
+
+def _scan_header(content: str, is_header) -> Tuple[List[str], Optional[int]]:
+    """
+    Collect the leading blank and header lines of a REW text export.
+    
+    Returns the (stripped) header lines and the offset of the first data
+    line, or None if no data line starts within content.
+    """
+    header = []
+    pos = 0
+    while pos < len(content):
+        end = content.find('\n', pos)
+        if end < 0:
+            end = len(content)
+        line = content[pos:end].strip()
+        if line and not is_header(line):
+            return header, pos
+        if line:
+            header.append(line)
+        pos = end + 1
+    return header, None
+
+
+def _split_numeric_block(content: str, is_header) -> Tuple[List[str], Optional[np.ndarray]]:
+    """
+    Split a REW text export into its header lines and numeric table.
+    
+    The text after the header is parsed in a single np.loadtxt call. The
+    table is None when that text is not a regular numeric table
+    (non-numeric rows, ragged columns, header lines interleaved with
+    data), in which case callers use their line-by-line parser.
+    """
+    header, pos = _scan_header(content, is_header)
+    if pos is None:
+        return header, None
+    
+    body = content[pos:]
+    if '*' in body:
+        return header, None
+    if is_header is _is_fr_header:
+        # A numeric table has no f/h at all, so only lower (copy) the
+        # body to look for a freq/Hz header when one of them is present
+        if any(ch in body for ch in 'fFhH'):
+            lower = body.lower()
+            if 'freq' in lower or 'hz' in lower:
+                return header, None
+        if ',' in body:
+            body = body.replace(',', ' ')
+    
+    return header, _load_table(io.StringIO(body))
 
 
 @dataclass
 class FrequencyResponseData:
-    """Parsed frequency response data"""
+    """
+    Parsed frequency response data.
+    
+    Parsers store magnitudes and phases as float32 (REW exports carry
+    far less precision than that); frequencies stay float64 since they
+    are the search/interpolation axis and are reported back as-is.
+    Statistics accumulate in float64.
+    """
     frequencies: np.ndarray
     magnitudes: np.ndarray  # in dB SPL
     phases: Optional[np.ndarray] = None
+    # Band masks keyed by (low, high, include_high); frequencies are not
+    # reassigned after construction
+    _band_masks: Dict[Tuple[float, float, bool], np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _is_sorted: Optional[bool] = field(
+        default=None, init=False, repr=False, compare=False)
+    
+    def _band(self, low: float = -np.inf, high: float = np.inf,
+              include_high: bool = True) -> Union[slice, np.ndarray]:
+        """
+        Index selecting low <= f <= high (f < high if not include_high).
+        
+        REW sweeps are ascending, so this is normally a contiguous slice
+        found by binary search; unsorted data (or data containing NaN)
+        gets the cached boolean mask instead.
+        """
+        f = self.frequencies
+        if self._is_sorted is None:
+            self._is_sorted = bool(np.all(f[1:] >= f[:-1]))
+        if not self._is_sorted:
+            return self._band_mask(low, high, include_high)
+        
+        i0 = np.searchsorted(f, low, side='left')
+        i1 = np.searchsorted(f, high, side='right' if include_high else 'left')
+        return slice(int(i0), int(max(i0, i1)))
+    
+    def _band_mask(self, low: float = -np.inf, high: float = np.inf,
+                  include_high: bool = True) -> np.ndarray:
+        """Boolean mask of low <= f <= high (f < high if not include_high), cached"""
+        key = (low, high, include_high)
+        mask = self._band_masks.get(key)
+        if mask is None:
+            f = self.frequencies
+            mask = (f >= low) & ((f <= high) if include_high else (f < high))
+            mask.flags.writeable = False
+            self._band_masks[key] = mask
+        return mask
     
     @property
     def frequency_range(self) -> Tuple[float, float]:
@@ -38,24 +188,26 @@ class FrequencyResponseData:
         """Get magnitude at specific frequency (interpolated)"""
         return float(np.interp(frequency, self.frequencies, self.magnitudes))
     
+    def get_magnitudes_at(self, frequencies: np.ndarray) -> np.ndarray:
+        """Get magnitudes at several frequencies (interpolated) in one call"""
+        return np.interp(frequencies, self.frequencies, self.magnitudes)
+    
     def get_average_level(self, low: float = 20, high: float = 20000) -> float:
         """Get average level in frequency range"""
-        mask = (self.frequencies >= low) & (self.frequencies <= high)
-        return float(np.mean(self.magnitudes[mask]))
+        return float(np.mean(self.magnitudes[self._band(low, high)], dtype=np.float64))
     
     def get_deviation(self, low: float = 20, high: float = 20000,
                      target: Optional[float] = None) -> float:
         """Calculate standard deviation from flat (or target)"""
-        mask = (self.frequencies >= low) & (self.frequencies <= high)
-        data = self.magnitudes[mask]
+        data = self.magnitudes[self._band(low, high)]
         if target is None:
-            target = np.mean(data)
-        return float(np.std(data - target))
+            target = np.mean(data, dtype=np.float64)
+        return float(np.std(data - target, dtype=np.float64))
 
 
 @dataclass
 class ImpulseResponseData:
-    """Parsed impulse response data"""
+    """Parsed impulse response data (parsers store samples as float32)"""
     samples: np.ndarray
     sample_rate: int
     
@@ -94,7 +246,13 @@ class REWParser:
     """
     
     def __init__(self):
-        self.supported_formats = ['.txt', '.mdat', '.wav', '.frd']
+        self._dispatch = {
+            '.txt': self._parse_txt_file,
+            '.mdat': self._parse_mdat_file,
+            '.wav': self._parse_wav_file,
+            '.frd': self._parse_frd_file,
+        }
+        self.supported_formats = list(self._dispatch)
     
     def parse_file(self, filepath: Union[str, Path]) -> REWMeasurement:
         """
@@ -113,19 +271,17 @@ class REWParser:
         
         suffix = filepath.suffix.lower()
         
-        if suffix == '.txt':
-            return self._parse_txt_file(filepath)
-        elif suffix == '.frd':
-            return self._parse_frd_file(filepath)
-        elif suffix == '.wav':
-            return self._parse_wav_file(filepath)
-        elif suffix == '.mdat':
-            return self._parse_mdat_file(filepath)
-        else:
+        handler = self._dispatch.get(suffix)
+        if handler is None:
             raise ValueError(f"Unsupported file format: {suffix}")
+        return handler(filepath)
     
     def _parse_txt_file(self, filepath: Path) -> REWMeasurement:
         """Parse REW text export file"""
+        measurement = self._parse_txt_table(filepath)
+        if measurement is not None:
+            return measurement
+        
         with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
             content = f.read()
         
@@ -135,13 +291,100 @@ class REWParser:
         else:
             return self._parse_fr_txt(content, filepath.stem)
     
+    def _parse_txt_table(self, filepath: Path) -> Optional[REWMeasurement]:
+        """
+        Fast path for a text export whose header fits in the first 4KB and
+        is followed by a purely numeric table.
+        
+        The header decides FR vs IR (the table itself cannot mention
+        'impulse'), and np.loadtxt reads the table straight from the file
+        without building the whole text in memory first. Returns None if
+        the file does not have that shape.
+        """
+        with open(filepath, 'rb') as f:
+            head = f.read(4096).decode('utf-8', errors='ignore')
+        
+        is_ir = 'IR Windows' in head or 'impulse' in head.lower()
+        header, pos = _scan_header(head, _is_ir_header if is_ir else _is_fr_header)
+        if pos is None:
+            return None
+        
+        # No comment character: any non-numeric line, including one
+        # starting with '#', sends the file to the general parser
+        arr = _load_table(filepath, skiprows=head.count('\n', 0, pos),
+                          comments=None, encoding='utf-8')
+        if arr is None:
+            return None
+        
+        if is_ir:
+            return self._ir_from_table(header, arr, filepath.stem)
+        return self._fr_from_table(header, arr, filepath.stem)
+    
+    def _fr_from_table(self, header: List[str], arr: np.ndarray,
+                       name: str) -> Optional[REWMeasurement]:
+        """Build an FR measurement from header lines and a numeric table"""
+        if arr.shape[1] < 2:
+            return None
+        
+        metadata = {}
+        for line in header:
+            if line.startswith('*') and ':' in line:
+                key, value = line[1:].split(':', 1)
+                metadata[key.strip()] = value.strip()
+        
+        # Skip rows whose frequency seems invalid
+        freq = arr[:, 0]
+        valid = ~((freq < 1) | (freq > 100000))
+        if not valid.any():
+            return None
+        
+        return REWMeasurement(
+            name=name,
+            frequency_response=FrequencyResponseData(
+                frequencies=freq[valid],
+                magnitudes=arr[valid, 1].astype(np.float32),
+                phases=arr[valid, 2].astype(np.float32) if arr.shape[1] >= 3 else None
+            ),
+            metadata=metadata
+        )
+    
+    def _ir_from_table(self, header: List[str], arr: np.ndarray,
+                       name: str) -> REWMeasurement:
+        """Build an IR measurement from header lines and a numeric table"""
+        sample_rate = 48000  # Default
+        for line in header:
+            if 'rate' in line.lower():
+                # Try to extract sample rate
+                match = _RATE_RE.search(line)
+                if match:
+                    sample_rate = int(match.group(1))
+        
+        return REWMeasurement(
+            name=name,
+            impulse_response=ImpulseResponseData(
+                # Time, Sample format or just sample values
+                samples=(arr[:, 1] if arr.shape[1] == 2 else arr[:, 0]).astype(np.float32),
+                sample_rate=sample_rate
+            ),
+            metadata={}
+        )
+    
     def _parse_fr_txt(self, content: str, name: str) -> REWMeasurement:
         """Parse frequency response text data"""
+        # Fast path: header lines followed by a regular numeric table
+        header, arr = _split_numeric_block(content, _is_fr_header)
+        if arr is not None:
+            measurement = self._fr_from_table(header, arr, name)
+            if measurement is not None:
+                return measurement
+        
         lines = content.strip().split('\n')
         
-        frequencies = []
-        magnitudes = []
-        phases = []
+        # At most one row per line; filled in place and trimmed at the end
+        frequencies = np.empty(len(lines))
+        magnitudes = np.empty(len(lines), dtype=np.float32)
+        phases = np.empty(len(lines), dtype=np.float32)
+        n_rows = n_phases = 0
         metadata = {}
         
         in_data = False
@@ -178,24 +421,26 @@ class REWParser:
                     if freq < 1 or freq > 100000:
                         continue
                     
-                    frequencies.append(freq)
-                    magnitudes.append(mag)
+                    frequencies[n_rows] = freq
+                    magnitudes[n_rows] = mag
+                    n_rows += 1
                     
                     if len(parts) >= 3:
-                        phases.append(float(parts[2]))
+                        phases[n_phases] = float(parts[2])
+                        n_phases += 1
                     
                     in_data = True
                     
             except (ValueError, IndexError):
                 continue
         
-        if len(frequencies) == 0:
+        if n_rows == 0:
             raise ValueError("No frequency response data found in file")
         
         fr_data = FrequencyResponseData(
-            frequencies=np.array(frequencies),
-            magnitudes=np.array(magnitudes),
-            phases=np.array(phases) if phases else None
+            frequencies=frequencies[:n_rows],
+            magnitudes=magnitudes[:n_rows],
+            phases=phases[:n_phases] if n_phases else None
         )
         
         return REWMeasurement(
@@ -206,9 +451,16 @@ class REWParser:
     
     def _parse_ir_txt(self, content: str, name: str) -> REWMeasurement:
         """Parse impulse response text data"""
+        # Fast path: one value per line, or (time, value) pairs
+        header, arr = _split_numeric_block(content, _is_ir_header)
+        if arr is not None:
+            return self._ir_from_table(header, arr, name)
+        
         lines = content.strip().split('\n')
         
-        samples = []
+        # At most one sample per line; filled in place and trimmed at the end
+        samples = np.empty(len(lines), dtype=np.float32)
+        n_samples = 0
         sample_rate = 48000  # Default
         metadata = {}
         
@@ -222,7 +474,7 @@ class REWParser:
             if line.startswith('*'):
                 if 'rate' in line.lower():
                     # Try to extract sample rate
-                    match = re.search(r'(\d+)', line)
+                    match = _RATE_RE.search(line)
                     if match:
                         sample_rate = int(match.group(1))
                 continue
@@ -233,17 +485,18 @@ class REWParser:
                 if len(parts) >= 1:
                     # Time, Sample format or just sample values
                     if len(parts) == 2:
-                        samples.append(float(parts[1]))
+                        samples[n_samples] = float(parts[1])
                     else:
-                        samples.append(float(parts[0]))
+                        samples[n_samples] = float(parts[0])
+                    n_samples += 1
             except ValueError:
                 continue
         
-        if len(samples) == 0:
+        if n_samples == 0:
             raise ValueError("No impulse response data found in file")
         
         ir_data = ImpulseResponseData(
-            samples=np.array(samples),
+            samples=samples[:n_samples],
             sample_rate=sample_rate
         )
         
@@ -255,12 +508,26 @@ class REWParser:
     
     def _parse_frd_file(self, filepath: Path) -> REWMeasurement:
         """Parse FRD (frequency response data) file format"""
+        arr = _load_table(filepath, comments=('#', '*'))
+        if arr is not None and arr.shape[1] >= 2:
+            return REWMeasurement(
+                name=filepath.stem,
+                frequency_response=FrequencyResponseData(
+                    frequencies=arr[:, 0],
+                    magnitudes=arr[:, 1].astype(np.float32),
+                    phases=arr[:, 2].astype(np.float32) if arr.shape[1] >= 3 else None
+                )
+            )
+        
+        # Irregular file: parse line by line, skipping what does not fit
         with open(filepath, 'r') as f:
             lines = f.readlines()
         
-        frequencies = []
-        magnitudes = []
-        phases = []
+        # At most one row per line; filled in place and trimmed at the end
+        frequencies = np.empty(len(lines))
+        magnitudes = np.empty(len(lines), dtype=np.float32)
+        phases = np.empty(len(lines), dtype=np.float32)
+        n_rows = n_phases = 0
         
         for line in lines:
             line = line.strip()
@@ -270,17 +537,19 @@ class REWParser:
             try:
                 parts = line.split()
                 if len(parts) >= 2:
-                    frequencies.append(float(parts[0]))
-                    magnitudes.append(float(parts[1]))
+                    frequencies[n_rows] = float(parts[0])
+                    magnitudes[n_rows] = float(parts[1])
+                    n_rows += 1
                     if len(parts) >= 3:
-                        phases.append(float(parts[2]))
+                        phases[n_phases] = float(parts[2])
+                        n_phases += 1
             except ValueError:
                 continue
         
         fr_data = FrequencyResponseData(
-            frequencies=np.array(frequencies),
-            magnitudes=np.array(magnitudes),
-            phases=np.array(phases) if phases else None
+            frequencies=frequencies[:n_rows],
+            magnitudes=magnitudes[:n_rows],
+            phases=phases[:n_phases] if n_phases else None
         )
         
         return REWMeasurement(
@@ -290,22 +559,30 @@ class REWParser:
     
     def _parse_wav_file(self, filepath: Path) -> REWMeasurement:
         """Parse WAV impulse response file"""
-        try:
-            from scipy.io import wavfile
+        wavfile = _scipy_wavfile()
+        if wavfile is not None:
             sample_rate, data = wavfile.read(filepath)
-        except ImportError:
+        else:
             # Fallback to manual WAV parsing
             sample_rate, data = self._read_wav_manual(filepath)
         
-        # Convert to mono if stereo
-        if len(data.shape) > 1:
-            data = np.mean(data, axis=1)
-        
-        # Normalize
+        # Integer PCM full scale
         if data.dtype == np.int16:
-            data = data.astype(np.float64) / 32768.0
+            scale = 1.0 / 32768.0
         elif data.dtype == np.int32:
-            data = data.astype(np.float64) / 2147483648.0
+            scale = 1.0 / 2147483648.0
+        else:
+            scale = 1.0
+        
+        # Convert to mono if stereo, folding the normalization into the
+        # channel average so each pass writes the float32 result directly
+        if data.ndim > 1:
+            num_channels = data.shape[1]
+            data = np.add.reduce(data, axis=1,
+                                 dtype=np.float32 if data.dtype.kind in 'iu' else None)
+            data *= np.float32(scale / num_channels)
+        elif scale != 1.0:
+            data = np.multiply(data, np.float32(scale), dtype=np.float32)
         
         ir_data = ImpulseResponseData(
             samples=data,
@@ -321,13 +598,11 @@ class REWParser:
         """Manual WAV file reader (no scipy dependency)"""
         with open(filepath, 'rb') as f:
             # RIFF header
-            riff = f.read(4)
-            if riff != b'RIFF':
+            header = f.read(_RIFF_HEADER.size)
+            if len(header) < _RIFF_HEADER.size:
                 raise ValueError("Not a valid WAV file")
-            
-            size = struct.unpack('<I', f.read(4))[0]
-            wave = f.read(4)
-            if wave != b'WAVE':
+            riff, size, wave = _RIFF_HEADER.unpack(header)
+            if riff != b'RIFF' or wave != b'WAVE':
                 raise ValueError("Not a valid WAV file")
             
             # Find fmt chunk
@@ -336,19 +611,15 @@ class REWParser:
             num_channels = 1
             
             while True:
-                chunk_id = f.read(4)
-                if len(chunk_id) < 4:
+                chunk = f.read(_CHUNK_HEADER.size)
+                if len(chunk) < 4:
                     break
-                    
-                chunk_size = struct.unpack('<I', f.read(4))[0]
+                
+                chunk_id, chunk_size = _CHUNK_HEADER.unpack(chunk)
                 
                 if chunk_id == b'fmt ':
-                    audio_format = struct.unpack('<H', f.read(2))[0]
-                    num_channels = struct.unpack('<H', f.read(2))[0]
-                    sample_rate = struct.unpack('<I', f.read(4))[0]
-                    byte_rate = struct.unpack('<I', f.read(4))[0]
-                    block_align = struct.unpack('<H', f.read(2))[0]
-                    bits_per_sample = struct.unpack('<H', f.read(2))[0]
+                    (audio_format, num_channels, sample_rate, byte_rate,
+                     block_align, bits_per_sample) = _FMT_CHUNK.unpack(f.read(_FMT_CHUNK.size))
                     
                     # Skip any extra format bytes
                     if chunk_size > 16:
@@ -360,12 +631,14 @@ class REWParser:
                         data = np.frombuffer(f.read(chunk_size), dtype=np.int16)
                     elif bits_per_sample == 24:
                         raw = f.read(chunk_size)
-                        # 24-bit to 32-bit conversion
-                        data = np.zeros(chunk_size // 3, dtype=np.int32)
-                        for i in range(len(data)):
-                            bytes_3 = raw[i*3:(i+1)*3]
-                            val = struct.unpack('<i', bytes_3 + (b'\x00' if bytes_3[2] < 128 else b'\xff'))[0]
-                            data[i] = val
+                        # 24-bit to 32-bit conversion: place each 3-byte
+                        # sample in the top bytes of a little-endian int32,
+                        # then an arithmetic shift sign-extends bit 23
+                        n = len(raw) // 3
+                        packed = np.zeros((n, 4), dtype=np.uint8)
+                        packed[:, 1:] = np.frombuffer(raw, dtype=np.uint8, count=n * 3).reshape(n, 3)
+                        data = packed.view('<i4').ravel()
+                        data >>= 8
                     elif bits_per_sample == 32:
                         data = np.frombuffer(f.read(chunk_size), dtype=np.float32)
                     else:
@@ -412,6 +685,27 @@ class REWParser:
         )
 
 
+@dataclass
+class PeakSet:
+    """Peaks or dips found in a response, ordered by prominence (largest first)"""
+    frequencies: np.ndarray  # Hz, rounded to 0.1
+    levels: np.ndarray  # dB, rounded to 0.1
+    prominences: np.ndarray  # dB, rounded to 0.1
+    kind: str  # "peak" or "dip"
+    
+    def __len__(self) -> int:
+        return len(self.frequencies)
+    
+    def to_dicts(self, limit: Optional[int] = None) -> List[Dict]:
+        """Report entries as {"frequency", "level", "prominence", "type"} dicts"""
+        return [
+            {"frequency": f, "level": l, "prominence": p, "type": self.kind}
+            for f, l, p in zip(self.frequencies[:limit].tolist(),
+                               self.levels[:limit].tolist(),
+                               self.prominences[:limit].tolist())
+        ]
+
+
 class REWAnalyzer:
     """
     Analyzes REW measurements for room acoustics assessment.
@@ -426,82 +720,103 @@ class REWAnalyzer:
         """
         Analyze frequency response for flatness and problem areas.
         """
-        if self.fr is None:
+        fr = self.fr
+        if fr is None:
             return {"error": "No frequency response data available"}
         
         if target_level is None:
             # Use average as target
-            target_level = self.fr.get_average_level(200, 4000)
+            target_level = fr.get_average_level(200, 4000)
         
         # Calculate deviations in different bands
-        bass = self.fr.magnitudes[(self.fr.frequencies >= 20) & (self.fr.frequencies < 200)]
-        mids = self.fr.magnitudes[(self.fr.frequencies >= 200) & (self.fr.frequencies < 2000)]
-        highs = self.fr.magnitudes[(self.fr.frequencies >= 2000) & (self.fr.frequencies <= 20000)]
+        bass = fr.magnitudes[fr._band(20, 200, include_high=False)]
+        mids = fr.magnitudes[fr._band(200, 2000, include_high=False)]
+        highs = fr.magnitudes[fr._band(2000, 20000)]
         
         # Find peaks and dips
-        peaks = self._find_peaks_dips(True)
-        dips = self._find_peaks_dips(False)
+        peaks, dips = self._peaks_and_dips
         
         # Overall flatness score (±3dB target)
-        full_range = self.fr.magnitudes[
-            (self.fr.frequencies >= 20) & (self.fr.frequencies <= 20000)
-        ]
+        full_range = fr.magnitudes[fr._band(20, 20000)]
         within_3db = np.sum(np.abs(full_range - target_level) <= 3) / len(full_range) * 100
         
         return {
             "target_level": round(target_level, 1),
-            "bass_average": round(np.mean(bass), 1) if len(bass) > 0 else None,
-            "bass_deviation": round(np.std(bass), 1) if len(bass) > 0 else None,
-            "mids_average": round(np.mean(mids), 1) if len(mids) > 0 else None,
-            "mids_deviation": round(np.std(mids), 1) if len(mids) > 0 else None,
-            "highs_average": round(np.mean(highs), 1) if len(highs) > 0 else None,
-            "highs_deviation": round(np.std(highs), 1) if len(highs) > 0 else None,
-            "overall_deviation": round(self.fr.get_deviation(20, 20000, target_level), 1),
+            "bass_average": round(np.mean(bass, dtype=np.float64), 1) if len(bass) > 0 else None,
+            "bass_deviation": round(np.std(bass, dtype=np.float64), 1) if len(bass) > 0 else None,
+            "mids_average": round(np.mean(mids, dtype=np.float64), 1) if len(mids) > 0 else None,
+            "mids_deviation": round(np.std(mids, dtype=np.float64), 1) if len(mids) > 0 else None,
+            "highs_average": round(np.mean(highs, dtype=np.float64), 1) if len(highs) > 0 else None,
+            "highs_deviation": round(np.std(highs, dtype=np.float64), 1) if len(highs) > 0 else None,
+            "overall_deviation": round(fr.get_deviation(20, 20000, target_level), 1),
             "flatness_score": round(within_3db, 1),
-            "peaks": peaks[:5],  # Top 5
-            "dips": dips[:5],
+            "peaks": peaks.to_dicts(5),  # Top 5
+            "dips": dips.to_dicts(5),
             "meets_target": within_3db >= 80,
             "recommendation": self._get_fr_recommendation(bass, mids, target_level, peaks, dips)
         }
     
-    def _find_peaks_dips(self, find_peaks: bool = True) -> List[Dict]:
-        """Find significant peaks or dips in response"""
+    @cached_property
+    def _peaks_and_dips(self) -> Tuple[PeakSet, PeakSet]:
+        """
+        Peaks and dips of the bass region, searched back to back on one
+        shared slice and kept for every later analysis of this measurement.
+        """
+        bass_region = self._bass_region()
+        return (self._find_peaks_dips(True, bass_region),
+                self._find_peaks_dips(False, bass_region))
+    
+    def _bass_region(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Frequencies and magnitudes below 500Hz, where modal problems live"""
+        fr = self.fr
+        band = fr._band(high=500, include_high=False)
+        return fr.frequencies[band], fr.magnitudes[band]
+    
+    def _find_peaks_dips(self, find_peaks: bool = True,
+                         bass_region: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> PeakSet:
+        """
+        Find significant peaks or dips in response.
+        
+        Args:
+            find_peaks: Look for peaks (True) or dips (False)
+            bass_region: (frequencies, magnitudes) from _bass_region(), so
+                callers searching both directions slice the data once
+        """
+        kind = "peak" if find_peaks else "dip"
         if self.fr is None:
-            return []
+            return PeakSet(np.empty(0), np.empty(0), np.empty(0), kind)
         
-        from scipy import signal as sig
+        sig = _scipy_signal()
         
         # Only look at bass region for modal problems
-        mask = self.fr.frequencies < 500
-        freqs = self.fr.frequencies[mask]
-        mags = self.fr.magnitudes[mask]
+        freqs, mags = bass_region if bass_region is not None else self._bass_region()
         
         if find_peaks:
             indices, props = sig.find_peaks(mags, prominence=3, height=-10)
         else:
             indices, props = sig.find_peaks(-mags, prominence=3, height=-80)
         
-        results = []
-        for i, idx in enumerate(indices):
-            results.append({
-                "frequency": round(freqs[idx], 1),
-                "level": round(mags[idx], 1),
-                "prominence": round(props["prominences"][i], 1) if "prominences" in props else None,
-                "type": "peak" if find_peaks else "dip"
-            })
-        
-        # Sort by prominence
-        results.sort(key=lambda x: x.get("prominence", 0) or 0, reverse=True)
-        return results
+        # Order by rounded prominence; the stable sort keeps ties in
+        # frequency order
+        prominences = np.round(props["prominences"], 1)
+        order = np.argsort(-prominences, kind='stable')
+        indices = indices[order]
+        
+        return PeakSet(
+            frequencies=np.round(freqs[indices], 1),
+            levels=np.round(mags[indices].astype(np.float64), 1),
+            prominences=prominences[order],
+            kind=kind
+        )
     
     def _get_fr_recommendation(self, bass: np.ndarray, mids: np.ndarray,
-                               target: float, peaks: List, dips: List) -> str:
+                               target: float, peaks: PeakSet, dips: PeakSet) -> str:
         """Generate recommendation based on FR analysis"""
         recommendations = []
         
         # Check bass level
         if len(bass) > 0:
-            bass_avg = np.mean(bass)
+            bass_avg = np.mean(bass, dtype=np.float64)
             if bass_avg > target + 3:
                 recommendations.append(
                     f"Bass is {bass_avg - target:.1f}dB hot. Add bass trapping."
@@ -512,18 +827,18 @@ class REWAnalyzer:
                 )
         
         # Check for severe peaks
-        for peak in peaks[:3]:
-            if peak.get("prominence", 0) > 6:
+        for freq, prominence in zip(peaks.frequencies[:3].tolist(), peaks.prominences[:3].tolist()):
+            if prominence > 6:
                 recommendations.append(
-                    f"Severe peak at {peak['frequency']:.0f}Hz (+{peak['prominence']:.1f}dB). "
+                    f"Severe peak at {freq:.0f}Hz (+{prominence:.1f}dB). "
                     f"Likely a room mode - add targeted bass trap."
                 )
         
         # Check for severe dips
-        for dip in dips[:3]:
-            if dip.get("prominence", 0) > 6:
+        for freq, prominence in zip(dips.frequencies[:3].tolist(), dips.prominences[:3].tolist()):
+            if prominence > 6:
                 recommendations.append(
-                    f"Severe dip at {dip['frequency']:.0f}Hz (-{dip['prominence']:.1f}dB). "
+                    f"Severe dip at {freq:.0f}Hz (-{prominence:.1f}dB). "
                     f"Likely a null point - consider moving listening position."
                 )
         
@@ -548,29 +863,32 @@ class REWAnalyzer:
         problems = []
         
         # Look for peaks in bass region
-        peaks = self._find_peaks_dips(True)
-        
-        for peak in peaks:
-            if peak["frequency"] < 300:
-                # Check if this matches a room mode
-                matches_mode = False
-                matching_mode = None
-                
-                if room_modes:
-                    for mode in room_modes:
-                        if abs(peak["frequency"] - mode) < 5:  # Within 5Hz
-                            matches_mode = True
-                            matching_mode = mode
-                            break
-                
-                problems.append({
-                    "frequency": peak["frequency"],
-                    "excess_db": peak.get("prominence", 0),
-                    "matches_mode": matches_mode,
-                    "matching_mode": matching_mode,
-                    "severity": "high" if peak.get("prominence", 0) > 6 else "medium",
-                    "treatment": f"Bass trap tuned to {peak['frequency']:.0f}Hz"
-                })
+        peaks = self._peaks_and_dips[0]
+        
+        low = peaks.frequencies < 300
+        peak_freqs = peaks.frequencies[low]
+        prominences = peaks.prominences[low]
+        
+        # Check which peaks match a room mode (within 5Hz), taking the
+        # first such mode in room_modes order for each peak
+        matched = np.zeros(len(peak_freqs), dtype=bool)
+        first_match = np.zeros(len(peak_freqs), dtype=np.intp)
+        if room_modes and len(peak_freqs):
+            within = np.abs(peak_freqs[:, None] - np.asarray(room_modes, dtype=float)) < 5
+            matched = within.any(axis=1)
+            first_match = within.argmax(axis=1)
+        
+        for freq, prominence, matches_mode, mode_idx in zip(
+                peak_freqs.tolist(), prominences.tolist(),
+                matched.tolist(), first_match.tolist()):
+            problems.append({
+                "frequency": freq,
+                "excess_db": prominence,
+                "matches_mode": matches_mode,
+                "matching_mode": room_modes[mode_idx] if matches_mode else None,
+                "severity": "high" if prominence > 6 else "medium",
+                "treatment": f"Bass trap tuned to {freq:.0f}Hz"
+            })
         
         return {
             "modal_problems": problems,
@@ -14,10 +14,13 @@ Key concepts:
 - Goal: Flat power spectrum for even sound scattering
 """
 
+import math
+from bisect import bisect_left
 import numpy as np
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
+from functools import lru_cache
 
 
 class LayoutType(Enum):
@@ -41,10 +44,46 @@ PRIMITIVE_POLYNOMIALS = {
 }
 
 
+def _poly_mask(taps: List[int]) -> int:
+    """
+    Feedback mask for a tap list. Taps are 1-indexed, so tap 5 means
+    bit 5 (which is index 4); the same mask is the Galois feedback
+    polynomial for a right-shifting, LSB-output register.
+    """
+    mask = 0
+    for tap in taps:
+        mask |= 1 << (tap - 1)
+    return mask
+
+
+# Per-order feedback masks, computed once
+_POLY_MASKS = {n: _poly_mask(taps) for n, taps in PRIMITIVE_POLYNOMIALS.items()}
+
+# (length, order) pairs sorted by length, with the lengths split out for bisect
+_ORDER_LENGTHS = tuple(sorted((2 ** n - 1, n) for n in PRIMITIVE_POLYNOMIALS))
+_LENGTHS = tuple(length for length, _ in _ORDER_LENGTHS)
+
+
+def _factor_pairs(length: int) -> Tuple[List[Tuple[int, int]], np.ndarray]:
+    """Non-trivial (rows, cols) factor pairs of length and their rows/cols ratios"""
+    factors = []
+    for i in range(2, int(length ** 0.5) + 1):
+        if length % i == 0:
+            j = length // i
+            factors.append((i, j))
+            factors.append((j, i))
+    ratios = np.array([r / c for r, c in factors])
+    return factors, ratios
+
+
+# Grid factorizations of every possible sequence length
+_FACTOR_TABLE = {length: _factor_pairs(length) for length in _LENGTHS}
+
+
 @dataclass
 class MLSResult:
     """Result of MLS generation for panel design"""
-    sequence: List[int]           # The binary sequence (1s and 0s)
+    sequence: np.ndarray          # The binary sequence (uint8 1s and 0s)
     order: int                    # The n in 2^n - 1
     length: int                   # N = 2^n - 1
     panel_width_mm: float         # Actual panel width
@@ -58,13 +97,18 @@ class MLSResult:
     balance_ratio: float          # Ratio of 1s to total (should be ~0.5)
     
     # For 2D grids
-    grid: Optional[List[List[int]]] = None
+    grid: Optional[np.ndarray] = None  # uint8, rows x cols
     grid_rows: int = 0
     grid_cols: int = 0
     
+    @property
+    def sequence_list(self) -> List[int]:
+        """The sequence as a list of Python ints, for JSON responses"""
+        return self.sequence.tolist()
+    
     def to_dict(self) -> Dict:
         return {
-            "sequence": self.sequence,
+            "sequence": self.sequence_list,
             "order": self.order,
             "length": self.length,
             "panel_width_mm": self.panel_width_mm,
@@ -74,7 +118,7 @@ class MLSResult:
             "num_slats": self.num_slats,
             "num_gaps": self.num_gaps,
             "balance_ratio": round(self.balance_ratio, 3),
-            "grid": self.grid,
+            "grid": self.grid.tolist() if self.grid is not None else None,
             "grid_rows": self.grid_rows,
             "grid_cols": self.grid_cols
         }
@@ -98,9 +142,9 @@ class PanelBOM:
     num_gaps: int
     slat_height_mm: float
     element_width_mm: float
-    cut_list: List[CutListItem]
-    slat_positions_mm: List[float]
-    gap_positions_mm: List[float]
+    sequence: np.ndarray             # uint8 pattern, 1 = slat, 0 = gap
+    slat_positions_mm: np.ndarray
+    gap_positions_mm: np.ndarray
     
     # Material estimates
     wood_area_m2: float
@@ -110,7 +154,34 @@ class PanelBOM:
     # Construction notes
     notes: List[str]
     
+    @property
+    def cut_list(self) -> List[CutListItem]:
+        """One CutListItem per element, built on demand from the pattern"""
+        width = self.element_width_mm
+        return [
+            CutListItem(
+                element_type="slat" if bit == 1 else "gap",
+                position_mm=i * width,
+                width_mm=width,
+                index=i
+            )
+            for i, bit in enumerate(self.sequence.tolist())
+        ]
+    
     def to_dict(self) -> Dict:
+        # Cut list straight from the pattern, rounded in one pass
+        width = round(self.element_width_mm, 1)
+        positions = np.round(np.arange(len(self.sequence)) * self.element_width_mm, 1)
+        cut_list = [
+            {
+                "type": "slat" if bit == 1 else "gap",
+                "position_mm": position,
+                "width_mm": width,
+                "index": i
+            }
+            for i, (bit, position) in enumerate(zip(self.sequence.tolist(), positions.tolist()))
+        ]
+        
         return {
             "total_slat_width_mm": round(self.total_slat_width_mm, 1),
             "total_gap_width_mm": round(self.total_gap_width_mm, 1),
@@ -118,17 +189,9 @@ class PanelBOM:
             "num_gaps": self.num_gaps,
             "slat_height_mm": self.slat_height_mm,
             "element_width_mm": round(self.element_width_mm, 1),
-            "cut_list": [
-                {
-                    "type": item.element_type,
-                    "position_mm": round(item.position_mm, 1),
-                    "width_mm": round(item.width_mm, 1),
-                    "index": item.index
-                }
-                for item in self.cut_list
-            ],
-            "slat_positions_mm": [round(p, 1) for p in self.slat_positions_mm],
-            "gap_positions_mm": [round(p, 1) for p in self.gap_positions_mm],
+            "cut_list": cut_list,
+            "slat_positions_mm": np.round(self.slat_positions_mm, 1).tolist(),
+            "gap_positions_mm": np.round(self.gap_positions_mm, 1).tolist(),
             "wood_area_m2": round(self.wood_area_m2, 3),
             "fabric_area_m2": round(self.fabric_area_m2, 3),
             "absorber_area_m2": round(self.absorber_area_m2, 3),
@@ -136,6 +199,95 @@ class PanelBOM:
         }
 
 
+def _galois_state(order: int, poly_mask: int, register):
+    """
+    Galois state that emits the same bits as a Fibonacci register.
+    
+    A Fibonacci register emits its own bits first, MSB first. Output j
+    of the Galois form is state bit j XOR the feedback of earlier
+    outputs i < j through polynomial bit j-1-i. Works elementwise on
+    integer arrays of registers as well as on a single int.
+    """
+    outputs = [(register >> (order - 1 - j)) & 1 for j in range(order)]
+    state = register & 0
+    for j in range(order):
+        bit = outputs[j]
+        for i in range(j):
+            bit ^= outputs[i] & (poly_mask >> (j - 1 - i))
+        state |= (bit & 1) << j
+    return state
+
+
+@lru_cache(maxsize=16)
+def _galois_cycle(order: int, poly_mask: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One period of the Galois register started from state 1, as the
+    output bits followed by their first period again (minus the last
+    bit), plus the step at which each state occurs in that period.
+    
+    Every non-zero state lies on this single cycle, so the sequence for
+    any start state is a window of the doubled output.
+    """
+    length = 2 ** order - 1
+    outputs = np.empty(2 * length - 1, dtype=np.uint8)
+    positions = np.zeros(length + 1, dtype=np.intp)
+    
+    state = 1
+    for i in range(length):
+        positions[state] = i
+        lsb = state & 1
+        outputs[i] = lsb
+        state >>= 1
+        if lsb:
+            state ^= poly_mask
+    outputs[length:] = outputs[:length - 1]
+    
+    outputs.flags.writeable = False
+    positions.flags.writeable = False
+    return outputs, positions
+
+
+@lru_cache(maxsize=64)
+def _lfsr_sequence(order: int, poly_mask: int, register: int) -> np.ndarray:
+    """
+    MLS for a primitive polynomial's feedback mask, starting from a
+    non-zero Fibonacci register state.
+    
+    The register only picks where to start on the order's single
+    cycle, so the result is a read-only window of _galois_cycle();
+    results are also cached per (order, poly_mask, register).
+    """
+    length = 2 ** order - 1
+    outputs, positions = _galois_cycle(order, poly_mask)
+    start = positions[_galois_state(order, poly_mask, register)]
+    return outputs[start:start + length]
+
+
+# Construction notes for a BOM; one line per note
+_BOM_NOTES_TEMPLATE = "\n".join([
+    "MLS ORDER: n={order}, generating {length} elements",
+    "ELEMENT WIDTH: {element_width:.1f}mm (adjusted from preferred to fit panel exactly)",
+    "BALANCE: {reflective_pct:.1f}% reflective / {absorptive_pct:.1f}% absorptive",
+    "",
+    "CONSTRUCTION SEQUENCE:",
+    "1. Build frame: {panel_width}mm x {panel_height}mm x {frame_depth}mm deep",
+    "2. Install absorption material ({absorber_depth}mm thick) in frame",
+    "3. Cover with acoustically transparent fabric (Guilford of Maine FR701 or similar)",
+    "4. Cut {num_slats} slats: each {element_width:.1f}mm wide x {panel_height}mm tall x {slat_thickness}mm thick",
+    "5. Mount slats at the positions indicated in the cut list below",
+    "6. Use spacers to ensure consistent gap widths",
+    "",
+    "ACOUSTIC PRINCIPLE:",
+    "• Slats (1s): Reflect high frequencies, keeping the room 'live'",
+    "• Gaps (0s): Allow sound through to the absorber behind",
+    "• MLS pattern: Pseudo-random sequence provides flat power spectrum",
+    "• Result: Even scattering without frequency coloration",
+    "",
+    "FOR ADJACENT PANELS:",
+    "Use the INVERSE pattern (flip 1s and 0s) to avoid repetition artifacts",
+])
+
+
 class MLSGenerator:
     """
     Maximum Length Sequence Generator using Linear Feedback Shift Register (LFSR)
@@ -146,6 +298,7 @@ class MLSGenerator:
     
     def __init__(self):
         self.polynomials = PRIMITIVE_POLYNOMIALS
+        self._poly_masks = _POLY_MASKS
     
     def find_optimal_order(self, target_elements: int) -> Tuple[int, int]:
         """
@@ -157,77 +310,92 @@ class MLSGenerator:
         Returns:
             Tuple of (order n, sequence length N = 2^n - 1)
         """
-        available_orders = sorted(self.polynomials.keys())
-        
-        best_order = available_orders[0]
-        best_length = 2 ** best_order - 1
-        best_diff = abs(target_elements - best_length)
-        
-        for order in available_orders:
-            length = 2 ** order - 1
-            diff = abs(target_elements - length)
-            
-            if diff < best_diff:
-                best_order = order
-                best_length = length
-                best_diff = diff
-        
-        return best_order, best_length
+        i = bisect_left(_LENGTHS, target_elements)
+        if i == len(_LENGTHS):
+            i -= 1
+        elif i > 0 and target_elements - _LENGTHS[i - 1] <= _LENGTHS[i] - target_elements:
+            # Ties go to the shorter sequence
+            i -= 1
+        
+        length, order = _ORDER_LENGTHS[i]
+        return order, length
     
-    def generate_mls(self, order: int, seed: int = None) -> List[int]:
+    def generate_mls(self, order: int, seed: int = None) -> np.ndarray:
         """
-        Generate a Maximum Length Sequence using LFSR (Fibonacci configuration).
+        Generate a Maximum Length Sequence using LFSR.
         
         The algorithm uses XOR operations on specific "tap" positions
         defined by primitive polynomials to generate pseudo-random sequences.
+        The seed is the state of a Fibonacci register (output taken from
+        bit n-1); the sequence itself is stepped in the equivalent Galois
+        configuration, which emits the same bits with one conditional XOR
+        per step.
         
         Args:
             order: The n in 2^n - 1 (determines sequence length)
             seed: Initial state of the register (if None, uses all 1s)
             
         Returns:
-            List of 0s and 1s of length 2^n - 1
+            Read-only uint8 array of 0s and 1s of length 2^n - 1 (shared
+            between calls with the same order and seed)
         """
-        if order not in self.polynomials:
+        poly_mask = self._poly_masks.get(order)
+        if poly_mask is None:
             raise ValueError(f"Order {order} not supported. Available: {list(self.polynomials.keys())}")
         
-        taps = self.polynomials[order]
-        length = 2 ** order - 1
+        mask = (1 << order) - 1
         
         # Initialize register with seed (all 1s if not specified)
         if seed is None:
-            register = (1 << order) - 1  # All 1s
+            register = mask  # All 1s
         else:
-            register = seed & ((1 << order) - 1)
+            register = seed & mask
             if register == 0:
                 register = 1  # Must be non-zero
         
-        sequence = []
+        return _lfsr_sequence(order, poly_mask, register)
+    
+    def generate_mls_batch(self, order: int, seeds) -> np.ndarray:
+        """
+        Generate the MLS for several seeds at once.
         
-        for _ in range(length):
-            # Output is the most significant bit (bit n-1)
-            output = (register >> (order - 1)) & 1
-            sequence.append(output)
-            
-            # Calculate feedback bit using XOR of tap positions
-            # Taps are 1-indexed, so tap 5 means bit 5 (which is index 4)
-            feedback = 0
-            for tap in taps:
-                feedback ^= (register >> (tap - 1)) & 1
+        All non-zero seeds put the register on the same maximal cycle,
+        so each row is a rotation of one period; the rows are gathered
+        from it in a single indexing step rather than stepping K
+        registers.
+        
+        Args:
+            order: The n in 2^n - 1 (determines sequence length)
+            seeds: K register seeds, each as for generate_mls()
             
-            # Shift register left and insert feedback at LSB
-            register = ((register << 1) | feedback) & ((1 << order) - 1)
+        Returns:
+            (K, 2^n - 1) uint8 array; row k equals generate_mls(order, seeds[k])
+        """
+        poly_mask = self._poly_masks.get(order)
+        if poly_mask is None:
+            raise ValueError(f"Order {order} not supported. Available: {list(self.polynomials.keys())}")
         
-        return sequence
+        length = 2 ** order - 1
+        # Same seed handling as generate_mls: None is all 1s, 0 becomes 1
+        registers = np.array(
+            [length if seed is None else int(seed) & length for seed in seeds],
+            dtype=np.int64
+        )
+        registers[registers == 0] = 1
+        
+        outputs, positions = _galois_cycle(order, poly_mask)
+        offsets = positions[_galois_state(order, poly_mask, registers)]
+        windows = np.lib.stride_tricks.sliding_window_view(outputs, length)
+        return windows[offsets]
     
-    def generate_inverse(self, sequence: List[int]) -> List[int]:
+    def generate_inverse(self, sequence: np.ndarray) -> np.ndarray:
         """
         Generate the inverse of a sequence (flip 1s and 0s).
         Useful for adjacent panels to avoid repetition patterns.
         """
-        return [1 - bit for bit in sequence]
+        return np.bitwise_xor(np.asarray(sequence, dtype=np.uint8), 1)
     
-    def fold_to_2d(self, sequence: List[int], rows: int, cols: int) -> List[List[int]]:
+    def fold_to_2d(self, sequence: np.ndarray, rows: int, cols: int) -> np.ndarray:
         """
         Fold a 1D MLS sequence into a 2D grid using diagonal folding.
         
@@ -241,22 +409,26 @@ class MLSGenerator:
             cols: Number of columns in the grid
             
         Returns:
-            2D grid of 0s and 1s
+            2D uint8 grid of 0s and 1s
         """
+        sequence = np.asarray(sequence, dtype=np.uint8)
         length = len(sequence)
         
         if rows * cols < length:
             # Grid too small, truncate sequence
             sequence = sequence[:rows * cols]
+            length = len(sequence)
         
         # Initialize grid with zeros
-        grid = [[0 for _ in range(cols)] for _ in range(rows)]
+        grid = np.zeros((rows, cols), dtype=np.uint8)
         
-        # Diagonal folding
-        for i, bit in enumerate(sequence):
-            row = i % rows
-            col = i % cols
-            grid[row][col] = bit
+        # Diagonal folding: bit i lands on (i % rows, i % cols). Indices
+        # lcm(rows, cols) apart land on the same cell and the later bit
+        # wins, so only the last lcm(rows, cols) bits are visible; within
+        # that span every bit has its own cell
+        start = max(0, length - math.lcm(rows, cols))
+        i = np.arange(start, length)
+        grid[i % rows, i % cols] = sequence[start:]
         
         return grid
     
@@ -292,7 +464,7 @@ class MLSGenerator:
         sequence = self.generate_mls(order, seed)
         
         # Count slats and gaps
-        num_slats = sum(sequence)
+        num_slats = int(np.count_nonzero(sequence))
         num_gaps = length - num_slats
         balance_ratio = num_slats / length
         
@@ -329,13 +501,8 @@ class MLSGenerator:
         """
         aspect_ratio = height / width
         
-        # Find all factor pairs
-        factors = []
-        for i in range(2, int(length ** 0.5) + 1):
-            if length % i == 0:
-                j = length // i
-                factors.append((i, j))
-                factors.append((j, i))
+        entry = _FACTOR_TABLE.get(length)
+        factors, ratios = entry if entry is not None else _factor_pairs(length)
         
         if not factors:
             # Prime number, use approximate grid
@@ -343,17 +510,8 @@ class MLSGenerator:
             cols = int(np.ceil(length / rows))
             return rows, cols
         
-        # Find factor pair closest to aspect ratio
-        best_factors = factors[0]
-        best_diff = abs((factors[0][0] / factors[0][1]) - aspect_ratio)
-        
-        for r, c in factors:
-            diff = abs((r / c) - aspect_ratio)
-            if diff < best_diff:
-                best_factors = (r, c)
-                best_diff = diff
-        
-        return best_factors
+        # Factor pair closest to aspect ratio (first one on ties)
+        return factors[int(np.abs(ratios - aspect_ratio).argmin())]
     
     def generate_bom(self, mls_result: MLSResult, 
                      slat_thickness_mm: float = 20,
@@ -374,25 +532,12 @@ class MLSGenerator:
         panel_height = mls_result.panel_height_mm
         panel_width = mls_result.panel_width_mm
         
-        # Build cut list
-        cut_list = []
-        slat_positions = []
-        gap_positions = []
-        
-        for i, bit in enumerate(sequence):
-            position = i * element_width
-            item = CutListItem(
-                element_type="slat" if bit == 1 else "gap",
-                position_mm=position,
-                width_mm=element_width,
-                index=i
-            )
-            cut_list.append(item)
-            
-            if bit == 1:
-                slat_positions.append(position)
-            else:
-                gap_positions.append(position)
+        # Element positions; the cut list itself is derived from the
+        # pattern on demand (PanelBOM.cut_list)
+        positions = np.arange(len(sequence)) * element_width
+        is_slat = sequence == 1
+        slat_positions = positions[is_slat]
+        gap_positions = positions[~is_slat]
         
         # Calculate totals
         total_slat_width = mls_result.num_slats * element_width
@@ -404,28 +549,19 @@ class MLSGenerator:
         absorber_area = fabric_area  # Same as full panel
         
         # Construction notes
-        notes = [
-            f"MLS ORDER: n={mls_result.order}, generating {mls_result.length} elements",
-            f"ELEMENT WIDTH: {element_width:.1f}mm (adjusted from preferred to fit panel exactly)",
-            f"BALANCE: {mls_result.balance_ratio*100:.1f}% reflective / {(1-mls_result.balance_ratio)*100:.1f}% absorptive",
-            "",
-            "CONSTRUCTION SEQUENCE:",
-            f"1. Build frame: {panel_width}mm x {panel_height}mm x {absorber_depth_mm + slat_thickness_mm}mm deep",
-            f"2. Install absorption material ({absorber_depth_mm}mm thick) in frame",
-            "3. Cover with acoustically transparent fabric (Guilford of Maine FR701 or similar)",
-            f"4. Cut {mls_result.num_slats} slats: each {element_width:.1f}mm wide x {panel_height}mm tall x {slat_thickness_mm}mm thick",
-            "5. Mount slats at the positions indicated in the cut list below",
-            "6. Use spacers to ensure consistent gap widths",
-            "",
-            "ACOUSTIC PRINCIPLE:",
-            "• Slats (1s): Reflect high frequencies, keeping the room 'live'",
-            "• Gaps (0s): Allow sound through to the absorber behind",
-            "• MLS pattern: Pseudo-random sequence provides flat power spectrum",
-            "• Result: Even scattering without frequency coloration",
-            "",
-            "FOR ADJACENT PANELS:",
-            "Use the INVERSE pattern (flip 1s and 0s) to avoid repetition artifacts",
-        ]
+        notes = _BOM_NOTES_TEMPLATE.format(
+            order=mls_result.order,
+            length=mls_result.length,
+            element_width=element_width,
+            reflective_pct=mls_result.balance_ratio * 100,
+            absorptive_pct=(1 - mls_result.balance_ratio) * 100,
+            panel_width=panel_width,
+            panel_height=panel_height,
+            frame_depth=absorber_depth_mm + slat_thickness_mm,
+            absorber_depth=absorber_depth_mm,
+            num_slats=mls_result.num_slats,
+            slat_thickness=slat_thickness_mm,
+        ).split("\n")
         
         return PanelBOM(
             total_slat_width_mm=total_slat_width,
@@ -434,7 +570,7 @@ class MLSGenerator:
             num_gaps=mls_result.num_gaps,
             slat_height_mm=panel_height,
             element_width_mm=element_width,
-            cut_list=cut_list,
+            sequence=sequence,
             slat_positions_mm=slat_positions,
             gap_positions_mm=gap_positions,
             wood_area_m2=wood_area,
@@ -444,11 +580,12 @@ class MLSGenerator:
         )
 
 
-def get_all_mls_orders() -> List[Dict]:
-    """
-    Get all available MLS orders with their properties.
-    Useful for UI dropdowns.
-    """
+# Shared by design_hybrid_panel; MLSGenerator keeps no per-call state
+_DEFAULT_GENERATOR = MLSGenerator()
+
+
+def _describe_orders() -> Tuple[Dict, ...]:
+    """Properties of every available MLS order"""
     orders = []
     for n, taps in PRIMITIVE_POLYNOMIALS.items():
         length = 2 ** n - 1
@@ -463,7 +600,18 @@ def get_all_mls_orders() -> List[Dict]:
             "taps": taps,
             "description": f"N={length} elements ({num_ones} slats, {num_zeros} gaps)"
         })
-    return orders
+    return tuple(orders)
+
+
+_MLS_ORDERS = _describe_orders()
+
+
+def get_all_mls_orders() -> List[Dict]:
+    """
+    Get all available MLS orders with their properties.
+    Useful for UI dropdowns.
+    """
+    return [dict(order) for order in _MLS_ORDERS]
 
 
 def design_hybrid_panel(
@@ -492,14 +640,13 @@ def design_hybrid_panel(
     Returns:
         Complete panel design with BOM
     """
-    generator = MLSGenerator()
+    generator = _DEFAULT_GENERATOR
     
-    # Parse layout type
-    layout_type = LayoutType.HORIZONTAL_1D
-    if layout == "vertical_1d":
-        layout_type = LayoutType.VERTICAL_1D
-    elif layout == "grid_2d":
-        layout_type = LayoutType.GRID_2D
+    # Parse layout type; anything unrecognised is laid out horizontally
+    try:
+        layout_type = LayoutType(layout)
+    except ValueError:
+        layout_type = LayoutType.HORIZONTAL_1D
     
     # Design the panel
     mls_result = generator.design_panel(
@@ -522,7 +669,7 @@ def design_hybrid_panel(
         "mls": mls_result.to_dict(),
         "bom": bom.to_dict(),
         "visualization": {
-            "pattern": mls_result.sequence,
+            "pattern": mls_result.sequence_list,
             "element_width_mm": mls_result.element_width_mm,
             "panel_width_mm": panel_width_mm,
             "panel_height_mm": panel_height_mm,
@@ -534,7 +681,7 @@ def design_hybrid_panel(
     if generate_inverse:
         inverse_sequence = generator.generate_inverse(mls_result.sequence)
         result["inverse"] = {
-            "sequence": inverse_sequence,
+            "sequence": inverse_sequence.tolist(),
             "description": "Use this pattern for adjacent panels to avoid repetition"
         }
     
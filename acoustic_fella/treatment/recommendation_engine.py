@@ -474,7 +474,8 @@ def generate_quick_recommendations(length: float, width: float, height: float,
     mode_calc = engine.mode_calc
     
     # Quick analysis
-    modes = mode_calc.calculate_all_modes(200)
+    # Mode table up to 200 Hz; the calculator is fresh, so as_arrays builds it
+    below_200 = engine.schroeder.compare_modal_density(mode_calc.as_arrays(200), [0.0, 200.0])
     axial_modes = mode_calc.get_axial_modes(200)
     bonello = mode_calc.bonello_analysis()
     ratios = mode_calc.get_optimal_ratios()
@@ -489,7 +490,7 @@ def generate_quick_recommendations(length: float, width: float, height: float,
         },
         "modal_analysis": {
             "first_mode": round(axial_modes[0].frequency, 1) if axial_modes else None,
-            "total_modes_under_200hz": len([m for m in modes if m.frequency < 200]),
+            "total_modes_under_200hz": int(below_200["counts"][0]),
             "passes_bonello": bonello["passes_bonello"],
             "ratio_quality": ratios["comparisons"][ratios["best_match"]]["match_quality"]
         },
@@ -272,7 +272,7 @@ def analyze_room():
 
         # Problems - find clustered modes
         problems = []
-        freqs = sorted([m.frequency for m in modes])
+        freqs = mode_calc.as_arrays(max_frequency)[0].tolist()
         for i in range(len(freqs) - 1):
             gap = freqs[i+1] - freqs[i]
             if gap < 5 and freqs[i] < 300:
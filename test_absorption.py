@@ -0,0 +1,65 @@
+"""
+Test that absorption results follow edits to AbsorptionCalculator surfaces
+"""
+
+import dataclasses
+
+import pytest
+
+from acoustic_fella.core.absorption import AbsorptionCalculator, Surface, SurfaceType
+
+
+def _breakdown_total(calc, freq):
+    return sum(s["absorption_by_frequency"][freq] for s in calc.get_surface_breakdown())
+
+
+def _edited_calculator():
+    calc = AbsorptionCalculator(5.0, 4.0, 2.7)
+    calc.analyze()  # results computed before the edits must not stick
+    calc.add_surface(Surface("Panel", 2.4, SurfaceType.CARPET))
+    calc.set_surface_material("ceiling", SurfaceType.CONCRETE)
+    return calc
+
+
+def test_surfaces_cannot_be_edited_behind_the_calculator():
+    calc = AbsorptionCalculator(5.0, 4.0, 2.7)
+    assert isinstance(calc.surfaces, tuple)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        calc.surfaces[0].area = 12.0
+    with pytest.raises(AttributeError):
+        calc.surfaces.append(Surface("Panel", 2.4, SurfaceType.CARPET))
+
+
+def test_analysis_follows_surface_edits():
+    calc = _edited_calculator()
+    fresh = AbsorptionCalculator(5.0, 4.0, 2.7)
+    fresh.set_surface_material("ceiling", SurfaceType.CONCRETE)
+    fresh.add_surface(Surface("Panel", 2.4, SurfaceType.CARPET))
+
+    result = calc.analyze()
+    expected = fresh.analyze()
+    assert result.current_absorption == expected.current_absorption
+    assert result.current_t60 == expected.current_t60
+    for freq in calc.FREQUENCIES:
+        assert calc.calculate_t60(freq) == fresh.calculate_t60(freq)
+
+
+def test_analysis_agrees_with_surface_breakdown():
+    calc = _edited_calculator()
+    result = calc.analyze()
+    for freq in calc.FREQUENCIES:
+        expected = sum(s.get_absorption(freq) for s in calc.surfaces)
+        assert calc.calculate_total_absorption(freq) == pytest.approx(expected, rel=1e-12)
+        assert result.current_absorption[freq] == pytest.approx(_breakdown_total(calc, freq), abs=0.05)
+        assert calc.calculate_total_absorption(freq) == pytest.approx(result.current_absorption[freq])
+    assert calc.calculate_total_absorption(63) == pytest.approx(sum(s.area for s in calc.surfaces) * 0.1)
+
+
+def test_set_surface_material_updates_results():
+    calc = AbsorptionCalculator(5.0, 4.0, 2.7)
+    before = calc.calculate_total_absorption(500)
+    calc.set_surface_material("floor", SurfaceType.CARPET)
+    assert calc.calculate_total_absorption(500) != before
+    assert calc.surfaces[0].surface_type is SurfaceType.CARPET
+    with pytest.raises(ValueError):
+        calc.set_surface_material("skylight", SurfaceType.GLASS)
@@ -0,0 +1,73 @@
+"""
+Test MLS generation, including the batched multi-seed path
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from acoustic_fella.treatment.mls_generator import (
+    MLSGenerator, PRIMITIVE_POLYNOMIALS, design_hybrid_panel
+)
+
+
+def _reference_mls(order, seed):
+    """Bit-by-bit Fibonacci LFSR, output from bit n-1."""
+    taps = PRIMITIVE_POLYNOMIALS[order]
+    mask = (1 << order) - 1
+    register = mask if seed is None else (seed & mask) or 1
+    out = []
+    for _ in range(2 ** order - 1):
+        out.append((register >> (order - 1)) & 1)
+        feedback = 0
+        for tap in taps:
+            feedback ^= (register >> (tap - 1)) & 1
+        register = ((register << 1) | feedback) & mask
+    return out
+
+
+@pytest.mark.parametrize("order", sorted(PRIMITIVE_POLYNOMIALS))
+def test_generate_mls_is_maximal_and_balanced(order):
+    seq = MLSGenerator().generate_mls(order)
+    length = 2 ** order - 1
+    assert seq.dtype == np.uint8 and len(seq) == length
+    assert int(seq.sum()) == 2 ** (order - 1)
+    # Two-valued periodic autocorrelation: N at lag 0, -1 elsewhere
+    bipolar = 1 - 2 * seq.astype(np.int64)
+    corr = np.real(np.fft.ifft(np.abs(np.fft.fft(bipolar)) ** 2)).round().astype(int)
+    assert corr[0] == length and set(corr[1:].tolist()) == {-1}
+
+
+@pytest.mark.parametrize("order", [3, 5, 7])
+def test_generate_mls_matches_fibonacci_register(order):
+    gen = MLSGenerator()
+    for seed in [None, 0, 1, 5, 2 ** order - 1, -3, 1000]:
+        assert gen.generate_mls(order, seed).tolist() == _reference_mls(order, seed)
+
+
+@pytest.mark.parametrize("order", sorted(PRIMITIVE_POLYNOMIALS))
+def test_batch_matches_single_seed_generation(order):
+    gen = MLSGenerator()
+    seeds = [None, 0, 1, 2, 7, 2 ** order - 1, 2 ** order, -1, 12345]
+    batch = gen.generate_mls_batch(order, seeds)
+
+    assert batch.shape == (len(seeds), 2 ** order - 1) and batch.dtype == np.uint8
+    for row, seed in zip(batch, seeds):
+        assert np.array_equal(row, gen.generate_mls(order, seed))
+
+
+def test_batch_edge_cases():
+    gen = MLSGenerator()
+    assert gen.generate_mls_batch(4, []).shape == (0, 15)
+    assert gen.generate_mls_batch(4, np.arange(3)).shape == (3, 15)
+    with pytest.raises(ValueError, match="not supported"):
+        gen.generate_mls_batch(11, [1])
+
+
+def test_design_hybrid_panel_is_json_serializable():
+    result = design_hybrid_panel(1200, 600, 50, layout="grid_2d", generate_inverse=True)
+    json.dumps(result)
+    pattern = result["visualization"]["pattern"]
+    assert result["inverse"]["sequence"] == [1 - b for b in pattern]
+    assert len(result["bom"]["cut_list"]) == result["mls"]["length"]
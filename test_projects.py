@@ -0,0 +1,121 @@
+"""
+Test project store persistence: JSON -> msgpack migration and WAL recovery
+"""
+
+import json
+import os
+
+import pytest
+
+from acoustic_fella.core import projects
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(projects, 'DATA_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _write_json_store(data_dir, *names):
+    records = [
+        projects.Project(id=name.lower(), name=name, updated_at='2024-01-01T00:00:00').to_dict()
+        for name in names
+    ]
+    (data_dir / 'projects.json').write_text(json.dumps(records))
+
+
+def _names(manager):
+    return sorted(p.name for p in manager.list_all())
+
+
+@pytest.mark.skipif(projects.msgpack is None, reason="msgpack not installed")
+def test_migration_keeps_changes_made_before_first_flush(data_dir):
+    _write_json_store(data_dir, 'Old')
+
+    manager = projects.ProjectManager()
+    assert (data_dir / 'projects.msgpack').exists()
+    manager.create('New')
+    pid = manager.create('Gone').id
+    manager.delete(pid)
+
+    # Restart without flushing, as after a crash
+    restarted = projects.ProjectManager()
+    assert _names(restarted) == ['New', 'Old']
+
+
+@pytest.mark.skipif(projects.msgpack is None, reason="msgpack not installed")
+def test_migration_replays_the_json_store_log(data_dir, monkeypatch):
+    _write_json_store(data_dir, 'Old')
+    monkeypatch.setattr(projects, 'msgpack', None)
+    projects.ProjectManager().create('Logged')
+    assert (data_dir / 'projects.json.wal').exists()
+    monkeypatch.undo()
+    monkeypatch.setattr(projects, 'DATA_DIR', str(data_dir))
+
+    manager = projects.ProjectManager()
+    assert _names(manager) == ['Logged', 'Old']
+    assert not (data_dir / 'projects.json.wal').exists()
+
+
+@pytest.mark.skipif(projects.msgpack is None, reason="msgpack not installed")
+def test_msgpack_store_without_msgpack_fails_loudly(data_dir, monkeypatch):
+    projects.ProjectManager().create('Saved')
+    monkeypatch.setattr(projects, 'msgpack', None)
+
+    with pytest.raises(RuntimeError, match='msgpack'):
+        projects.ProjectManager()
+
+
+def _seeded_manager():
+    manager = projects.ProjectManager()
+    manager.create('One')
+    return manager
+
+
+def test_torn_wal_tail_does_not_swallow_later_changes(data_dir):
+    manager = _seeded_manager()
+    with open(manager._wal_path, 'ab') as f:
+        f.write(b'{"op": "upsert", "id": "tor')  # crash mid-append
+
+    restarted = projects.ProjectManager()
+    assert 'One' in _names(restarted)
+    restarted.create('Two')
+
+    again = projects.ProjectManager()
+    assert 'One' in _names(again) and 'Two' in _names(again)
+
+
+def test_wal_record_without_newline_is_kept(data_dir):
+    manager = _seeded_manager()
+    with open(manager._wal_path, 'rb+') as f:
+        f.seek(-1, 2)
+        f.truncate()  # crash just before the trailing newline
+
+    restarted = projects.ProjectManager()
+    assert 'One' in _names(restarted)
+    restarted.create('Two')
+
+    again = projects.ProjectManager()
+    assert 'One' in _names(again) and 'Two' in _names(again)
+
+
+def test_compaction_folds_the_log_into_the_store(data_dir):
+    manager = _seeded_manager()
+    assert os.path.exists(manager._wal_path)
+
+    manager.compact()
+    assert not os.path.exists(manager._wal_path)
+    assert 'One' in _names(projects.ProjectManager())
+
+
+def test_wal_compacts_past_size_limit(data_dir, monkeypatch):
+    monkeypatch.setattr(projects.ProjectManager, 'WAL_COMPACT_BYTES', 1)
+    manager = _seeded_manager()
+    assert not os.path.exists(manager._wal_path)
+
+    with manager.batch():
+        manager.create('Two')
+        manager.create('Three')
+        assert os.path.exists(manager._wal_path)
+    assert not os.path.exists(manager._wal_path)
+    assert _names(projects.ProjectManager()) == sorted(["Sean's Studio", 'One', 'Two', 'Three'])
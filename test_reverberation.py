@@ -0,0 +1,90 @@
+"""
+Test reverberation metrics on synthetic impulse responses
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from acoustic_fella.core.reverberation import ReverberationAnalyzer, RoomTargets
+
+FS = 48000
+
+
+def _decay_ir(t60: float, duration: float = 2.0, seed: int = 0) -> np.ndarray:
+    """Exponentially decaying noise whose energy falls 60 dB in t60 seconds."""
+    t = np.arange(int(duration * FS)) / FS
+    rng = np.random.default_rng(seed)
+    ir = rng.standard_normal(t.size) * 10 ** (-3 * t / t60)
+    ir[0] = 5.0  # direct sound
+    return ir
+
+
+def _pure_decay_ir(t60: float, seed: int) -> np.ndarray:
+    """Decaying noise with no direct-sound spike, long enough to reach -60 dB."""
+    t = np.arange(int(3 * t60 * FS)) / FS
+    return np.random.default_rng(seed).standard_normal(t.size) * 10 ** (-3 * t / t60)
+
+
+@pytest.mark.parametrize("t60", [0.25, 0.5, 1.2])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_decay_times_recover_known_t60(t60, seed):
+    analysis = ReverberationAnalyzer(FS).analyze_impulse_response(_pure_decay_ir(t60, seed))
+    assert analysis.edt == pytest.approx(t60, rel=0.05)
+    assert analysis.t20 == pytest.approx(t60, rel=0.03)
+    assert analysis.t30 == pytest.approx(t60, rel=0.03)
+    assert analysis.t60 == analysis.t30
+
+
+def test_decay_time_fit_on_a_straight_line():
+    analyzer = ReverberationAnalyzer(FS)
+    t = np.arange(FS) / FS
+    curve = -60 * t / 0.4
+    assert analyzer.calculate_decay_time(curve, -5, -35) == pytest.approx(0.4, rel=1e-9)
+    assert analyzer.calculate_decay_time(curve, -5, -25) == pytest.approx(0.4, rel=1e-9)
+    assert analyzer.calculate_decay_time(curve, 0, -10) == pytest.approx(0.4, rel=1e-9)
+    assert np.isnan(analyzer.calculate_decay_time(curve[:FS // 10], -5, -35))
+
+
+def _reference_energies(ir: np.ndarray, early_ms: float):
+    ir = ir.astype(np.float64)
+    direct_idx = np.argmax(np.abs(ir))
+    early_end = direct_idx + int(early_ms / 1000 * FS)
+    return np.sum(ir[:early_end] ** 2), np.sum(ir[early_end:] ** 2), np.sum(ir ** 2)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_clarity_and_definition_match_direct_sums(dtype):
+    ir = _decay_ir(0.5).astype(dtype)
+    analyzer = ReverberationAnalyzer(FS)
+
+    early, late, _ = _reference_energies(ir, 80)
+    c80 = analyzer.calculate_clarity(ir, 80)
+    assert c80 == pytest.approx(10 * np.log10(early / late), abs=1e-9)
+
+    early, _, total = _reference_energies(ir, 50)
+    d50 = analyzer.calculate_definition(ir, 50)
+    assert d50 == pytest.approx(early / total, abs=1e-12)
+
+    metrics = analyzer.calculate_energy_metrics(ir)
+    assert metrics["clarity"] == c80
+    assert metrics["definition"] == d50
+
+
+def test_get_target_returns_a_plain_dict_copy():
+    target = RoomTargets.get_target("vocal_recording")
+    assert type(target) is dict
+    assert target == RoomTargets.TARGETS["vocal_recording"]
+    json.dumps(target)
+
+    target["t60_max"] = 9.9
+    assert RoomTargets.get_target("vocal_recording")["t60_max"] == 0.4
+    assert RoomTargets.get_target("unknown") == RoomTargets.TARGETS["mixing_mastering"]
+
+
+def test_evaluate_reports_range_midpoint():
+    result = RoomTargets.evaluate(0.5, "live_recording")
+    assert result["target_mid"] == pytest.approx(0.6)
+    assert result["status"] == "optimal"
+    assert RoomTargets.evaluate(0.5, "unknown")["status"] == "too_live"
@@ -0,0 +1,66 @@
+"""
+Test peak/dip detection results (PeakSet) on a synthetic frequency response
+"""
+
+import numpy as np
+
+from acoustic_fella.parsers.rew_parser import (
+    FrequencyResponseData, PeakSet, REWAnalyzer, REWMeasurement
+)
+
+
+def _bump(freqs, center, gain_db, width_hz=4.0):
+    return gain_db * np.exp(-0.5 * ((freqs - center) / width_hz) ** 2)
+
+
+def _analyzer():
+    freqs = np.arange(20.0, 1000.0, 0.5)
+    mags = (_bump(freqs, 60, 10) + _bump(freqs, 120, 6) + _bump(freqs, 200, 4)
+            + _bump(freqs, 90, -8)).astype(np.float32)
+    fr = FrequencyResponseData(frequencies=freqs, magnitudes=mags)
+    return REWAnalyzer(REWMeasurement(name="synthetic", frequency_response=fr))
+
+
+def test_peaks_and_dips_ordered_by_prominence():
+    peaks, dips = _analyzer()._peaks_and_dips
+
+    assert isinstance(peaks, PeakSet) and peaks.kind == "peak"
+    assert peaks.frequencies.tolist() == [60.0, 120.0, 200.0]
+    assert peaks.prominences.tolist() == sorted(peaks.prominences.tolist(), reverse=True)
+    assert peaks.levels[0] == 10.0
+
+    # The notch, then the flat valley between the 120 Hz and 200 Hz bumps
+    assert dips.kind == "dip" and len(dips) == 2
+    assert dips.frequencies.tolist() == [90.0, 160.0]
+    assert dips.levels.tolist() == [-8.0, 0.0]
+
+
+def test_to_dicts_limits_and_serializes():
+    peaks, _ = _analyzer()._peaks_and_dips
+    entries = peaks.to_dicts(2)
+
+    assert entries == [
+        {"frequency": 60.0, "level": 10.0, "prominence": peaks.prominences[0].item(), "type": "peak"},
+        {"frequency": 120.0, "level": 6.0, "prominence": peaks.prominences[1].item(), "type": "peak"},
+    ]
+    assert all(type(v) in (float, str) for e in entries for v in e.values())
+    assert len(peaks.to_dicts()) == len(peaks)
+
+
+def test_reports_use_the_peak_set():
+    analyzer = _analyzer()
+    report = analyzer.analyze_frequency_response()
+    assert [p["frequency"] for p in report["peaks"]] == [60.0, 120.0, 200.0]
+    assert [d["frequency"] for d in report["dips"]] == [90.0, 160.0]
+
+    modal = analyzer.identify_modal_problems([58.0, 121.5, 150.0, 119.0])
+    assert [(p["frequency"], p["matches_mode"], p["matching_mode"]) for p in modal["modal_problems"]] == [
+        (60.0, True, 58.0), (120.0, True, 121.5), (200.0, False, None)
+    ]
+    assert modal["worst_frequency"] == 60.0
+
+
+def test_no_frequency_response_gives_empty_sets():
+    analyzer = REWAnalyzer(REWMeasurement(name="empty"))
+    peaks = analyzer._find_peaks_dips(True)
+    assert len(peaks) == 0 and peaks.to_dicts() == []
@@ -0,0 +1,24 @@
+"""
+Test the array view of room modes and its callers
+"""
+
+from acoustic_fella.core.room_modes import RoomModeCalculator
+from acoustic_fella.treatment.recommendation_engine import generate_quick_recommendations
+
+
+def test_as_arrays_matches_calculated_modes():
+    calc = RoomModeCalculator(4.2, 2.83, 2.41)
+    modes = calc.calculate_all_modes(max_frequency=250)
+    freqs, p, q, r, type_code = calc.as_arrays(250)
+
+    assert freqs.tolist() == [m.frequency for m in modes]
+    assert list(zip(p.tolist(), q.tolist(), r.tolist())) == [(m.p, m.q, m.r) for m in modes]
+    assert freqs.tolist() == sorted(freqs.tolist())
+    assert not freqs.flags.writeable
+
+
+def test_quick_recommendations_count_modes_below_200hz():
+    recs = generate_quick_recommendations(4.2, 2.83, 2.41)
+    modes = RoomModeCalculator(4.2, 2.83, 2.41).calculate_all_modes(200)
+    expected = len([m for m in modes if m.frequency < 200])
+    assert recs["modal_analysis"]["total_modes_under_200hz"] == expected
@@ -0,0 +1,49 @@
+"""
+Test that the vectorized Schroeder analyses match their scalar counterparts
+"""
+
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from acoustic_fella.core.room_modes import ModeType, RoomModeCalculator
+from acoustic_fella.core.schroeder import SchroederAnalyzer
+
+
+@pytest.mark.parametrize("volume,t60,use_metric", [(28.6, 0.3, True), (100.0, 0.5, True), (1200.0, 0.4, False)])
+def test_frequency_behavior_batch_matches_scalar(volume, t60, use_metric):
+    analyzer = SchroederAnalyzer(volume, t60, use_metric)
+    fc = analyzer.calculate_schroeder_frequency()
+    # A log sweep plus the exact region boundaries
+    freqs = np.sort(np.concatenate([np.geomspace(20, 2000, 97), [fc / 2, fc, fc * 2]]))
+    batch = analyzer.get_frequency_behavior_batch(freqs)
+
+    assert batch["schroeder_frequency"] == pytest.approx(fc)
+    for i, f in enumerate(freqs.tolist()):
+        single = analyzer.get_frequency_behavior(f)
+        assert batch["frequency"][i] == f
+        assert batch["modal_density"][i] == pytest.approx(single["modal_density"])
+        assert round(batch["modal_overlap"][i], 2) == single["modal_overlap"]
+        assert bool(batch["is_modal"][i]) == single["is_modal"]
+        behavior, treatment = analyzer.FREQUENCY_BEHAVIORS[batch["region"][i]]
+        assert behavior == single["behavior"]
+        assert treatment == single["recommended_treatment"]
+
+
+@pytest.mark.parametrize("dims", [(4.2, 2.83, 2.41), (7.3, 5.1, 2.7), (3.0, 3.0, 3.0)])
+def test_compare_modal_density_matches_mode_list(dims):
+    calc = RoomModeCalculator(*dims)
+    modes = calc.calculate_all_modes(max_frequency=300)
+    analyzer = SchroederAnalyzer(dims[0] * dims[1] * dims[2], 0.3)
+    # Third-octave-ish edges, including some that land exactly on a mode
+    edges = np.unique(np.concatenate([np.geomspace(20, 300, 13), [modes[0].frequency, modes[5].frequency]]))
+
+    result = analyzer.compare_modal_density(calc.as_arrays(300), edges)
+    for i, (lo, hi) in enumerate(zip(edges[:-1].tolist(), edges[1:].tolist())):
+        in_band = [m for m in modes if lo <= m.frequency < hi]
+        assert result["counts"][i] == len(in_band)
+        assert result["axial_counts"][i] == sum(m.mode_type is ModeType.AXIAL for m in in_band)
+        assert result["density"][i] == pytest.approx(len(in_band) / (hi - lo))
+        expected, _ = quad(analyzer.calculate_modal_density, lo, hi)
+        assert result["expected_counts"][i] == pytest.approx(expected)
+        assert result["expected_density"][i] == pytest.approx(analyzer.calculate_modal_density(np.sqrt(lo * hi)))